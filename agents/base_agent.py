@@ -4,37 +4,183 @@ Base agent class for the multi-agent system.
 
 import asyncio
 import logging
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
 from shared.models import (
-    AgentConfig, AgentStatus, Message, MessageType, 
+    AgentConfig, AgentStatus, BatchProgress, Message, MessageType, 
     TaskRequest, TaskResponse, Conversation
 )
 from shared.config import get_agent_config
-from database.manager import get_db_session
-from database.models import Agent as DBAgent, AgentState as DBAgentState, Task as DBTask
+from .dispatcher import TaskDispatcher
+from database.manager import bulk_insert, dialect_insert, get_db_manager, get_db_session
+from database.memory_manager import memory_manager
+from database.models import (
+    Agent as DBAgent, AgentState as DBAgentState, Task as DBTask, Message as DBMessage
+)
 
 logger = logging.getLogger(__name__)
 
+# Write-behind buffer for message and task rows
+MAX_BATCH = 200  # rows per flush
+FLUSH_MS = 50  # max time a row waits in the buffer
+
+_write_queue: Optional[asyncio.Queue] = None
+_flusher_task: Optional[asyncio.Task] = None
+_FLUSH_SENTINEL = object()
+
+STATE_FLUSH_INTERVAL = 1.0  # seconds between agent state write-backs
+MAX_TRACKED_TASKS = 1000  # background task results kept per agent
+HEALTH_CHECK_TTL = 30.0  # seconds a healthy health check result is reused
+
+# Core insert statements for buffered rows (no ORM unit-of-work overhead)
+_MESSAGE_INSERT = DBMessage.__table__.insert()
+_TASK_INSERT = DBTask.__table__.insert()
+
+
+def _write_rows(items: List[tuple]) -> None:
+    """Insert buffered rows with one bulk insert and commit per table."""
+    grouped: Dict[Any, List[Dict[str, Any]]] = {}
+    for statement, row in items:
+        grouped.setdefault(statement, []).append(row)
+    
+    try:
+        with get_db_session() as session:
+            for statement, rows in grouped.items():
+                try:
+                    bulk_insert(session, statement.table, rows)
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    logger.error("Failed to write %d rows to %s: %s", len(rows), statement.table.name, e)
+                    
+    except Exception as e:
+        logger.error("Failed to flush buffered rows: %s", e)
+
+
+async def _flusher() -> None:
+    """Drain the write queue in batches of up to MAX_BATCH rows or FLUSH_MS."""
+    loop = asyncio.get_running_loop()
+    queue = _write_queue
+    stop = False
+    
+    while not stop:
+        item = await queue.get()
+        if item is _FLUSH_SENTINEL:
+            stop = True
+            batch = []
+        else:
+            batch = [item]
+        
+        deadline = loop.time() + FLUSH_MS / 1000
+        while not stop and len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _FLUSH_SENTINEL:
+                stop = True
+            else:
+                batch.append(item)
+        
+        if stop:
+            # Drain anything queued behind the sentinel
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not _FLUSH_SENTINEL:
+                    batch.append(item)
+        
+        if batch:
+            await asyncio.to_thread(_write_rows, batch)
+
+
+def _enqueue_row(statement: Any, row: Dict[str, Any]) -> None:
+    """Queue a row for the background flusher, or write it directly without a running loop."""
+    global _write_queue, _flusher_task
+    
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _write_rows([(statement, row)])
+        return
+    
+    if _flusher_task is None or _flusher_task.done():
+        _write_queue = asyncio.Queue()
+        _flusher_task = asyncio.create_task(_flusher())
+    
+    _write_queue.put_nowait((statement, row))
+
+
+async def flush_pending_writes() -> None:
+    """Stop the background flusher after writing every buffered row."""
+    global _write_queue, _flusher_task
+    
+    if _flusher_task is None or _flusher_task.done():
+        return
+    
+    _write_queue.put_nowait(_FLUSH_SENTINEL)
+    await _flusher_task
+    _write_queue = None
+    _flusher_task = None
+
 
 class BaseAgent(ABC):
     """Base class for all agents in the system."""
     
+    # Scores queued tasks for the dispatcher (higher runs first); None uses
+    # TaskRequest.priority. Override per instance or as a staticmethod.
+    task_scorer: Optional[Callable[[TaskRequest], float]] = None
+    
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
-        self.config = get_agent_config(agent_name)
+        self.config = get_agent_config(agent_name)  # cached per name in shared.config
         if not self.config:
             raise ValueError(f"Agent configuration not found: {agent_name}")
         
         self.status = AgentStatus.IDLE
         self.current_task: Optional[str] = None
         self.memory_usage = 0
-        self.last_activity = datetime.utcnow()
+        self.last_activity_ts = time.time()
         self.metadata: Dict[str, Any] = {}
+        # Static part of get_state, built once since the config does not change
+        self._state_config = {
+            "model": self.config.model,
+            "personality": self.config.personality,
+            "goal": self.config.goal
+        }
+        # Bound once so hot dispatch paths skip the attribute lookup per call
+        self._process_task_impl = self.process_task
+        
+        # Open the pool's connections before the first agent writes (no-op after the first agent)
+        get_db_manager().warm_pool()
+        
+        # Database ids, resolved once in _init_database_record
+        self._db_agent_id: Optional[int] = None
+        self._db_state_id: Optional[int] = None
+        self._db_agent_lock = threading.Lock()
+        
+        # Write-back state: status changes are flushed by _state_flusher
+        self._state_dirty = False
+        self._state_flusher_task: Optional[asyncio.Task] = None
+        
+        # Background task submissions, keyed by task id (oldest first)
+        self._submitted_tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dispatcher: Optional[TaskDispatcher] = None
+        
+        # Last healthy health check result and the lock that single-flights probes
+        self._health_cache: Optional[tuple] = None
+        self._health_lock = asyncio.Lock()
         
         # Initialize database record
         self._init_database_record()
@@ -43,127 +189,382 @@ class BaseAgent(ABC):
         """Initialize or update the agent's database record."""
         try:
             with get_db_session() as session:
-                # Check if agent exists
-                db_agent = session.query(DBAgent).filter(DBAgent.name == self.agent_name).first()
-                
-                if not db_agent:
-                    # Create new agent record
-                    db_agent = DBAgent(
-                        name=self.config.name,
-                        model=self.config.model,
-                        personality=self.config.personality,
-                        job_description=self.config.job_description,
-                        system_prompt=self.config.system_prompt,
-                        goal=self.config.goal,
-                        enabled=self.config.enabled,
-                        memory_enabled=self.config.memory_enabled,
-                        max_context_length=self.config.max_context_length
-                    )
-                    session.add(db_agent)
-                    session.commit()
-                    session.refresh(db_agent)
+                agent_values = {
+                    "model": self.config.model,
+                    "personality": self.config.personality,
+                    "job_description": self.config.job_description,
+                    "system_prompt": self.config.system_prompt,
+                    "goal": self.config.goal,
+                    "enabled": self.config.enabled,
+                    "memory_enabled": self.config.memory_enabled,
+                    "max_context_length": self.config.max_context_length
+                }
+                state_values = {
+                    "status": self.status.value,
+                    "current_task": self.current_task,
+                    "memory_usage": self.memory_usage,
+                    "last_activity": self.last_activity,
+                    "agent_metadata": self.metadata
+                }
                 
-                # Update or create agent state
-                db_state = session.query(DBAgentState).filter(
-                    DBAgentState.agent_id == db_agent.id
-                ).first()
-                
-                if not db_state:
-                    db_state = DBAgentState(
-                        agent_id=db_agent.id,
-                        status=self.status.value,
-                        current_task=self.current_task,
-                        memory_usage=self.memory_usage,
-                        last_activity=self.last_activity,
-                        agent_metadata=self.metadata
+                insert = dialect_insert(session)
+                if insert is not None:
+                    db_agent_id, db_state_id = self._upsert_database_record(
+                        session, insert, agent_values, state_values
                     )
-                    session.add(db_state)
                 else:
-                    db_state.status = self.status.value
-                    db_state.current_task = self.current_task
-                    db_state.memory_usage = self.memory_usage
-                    db_state.last_activity = self.last_activity
-                    db_state.agent_metadata = self.metadata
+                    db_agent_id, db_state_id = self._save_database_record(
+                        session, agent_values, state_values
+                    )
                 
                 session.commit()
-                logger.info(f"Agent {self.agent_name} database record initialized")
+                memory_manager.invalidate_agent(self.agent_name)
+                self._db_agent_id = db_agent_id
+                self._db_state_id = db_state_id
+                logger.debug("Agent %s database record initialized", self.agent_name)
                 
         except Exception as e:
-            logger.error(f"Failed to initialize database record for {self.agent_name}: {e}")
+            logger.error("Failed to initialize database record for %s: %s", self.agent_name, e)
     
-    def update_status(self, status: AgentStatus, task: Optional[str] = None):
-        """Update agent status and current task."""
+    def _upsert_database_record(
+        self,
+        session: Session,
+        insert: Callable,
+        agent_values: Dict[str, Any],
+        state_values: Dict[str, Any]
+    ) -> Tuple[int, int]:
+        """Write the agent and state rows with ON CONFLICT statements; return their ids."""
+        # Upsert the agent row keyed on its unique name
+        db_agent_id = session.execute(
+            insert(DBAgent)
+            .values(name=self.config.name, **agent_values)
+            .on_conflict_do_update(
+                index_elements=[DBAgent.name],
+                set_={**agent_values, "updated_at": datetime.utcnow()}
+            )
+            .returning(DBAgent.id)
+        ).scalar_one()
+        
+        # Update the agent state in place, creating it on first start
+        db_state_id = session.execute(
+            update(DBAgentState)
+            .where(DBAgentState.agent_id == db_agent_id)
+            .values(**state_values)
+            .returning(DBAgentState.id)
+        ).scalars().first()
+        
+        if db_state_id is None:
+            db_state_id = session.execute(
+                insert(DBAgentState)
+                .values(agent_id=db_agent_id, **state_values)
+                .returning(DBAgentState.id)
+            ).scalar_one()
+        
+        return db_agent_id, db_state_id
+    
+    def _save_database_record(
+        self,
+        session: Session,
+        agent_values: Dict[str, Any],
+        state_values: Dict[str, Any]
+    ) -> Tuple[int, int]:
+        """Write the agent and state rows by looking them up first; return their ids.
+        
+        Used on databases without ON CONFLICT support.
+        """
+        db_agent = session.query(DBAgent).filter(DBAgent.name == self.config.name).first()
+        if db_agent is None:
+            db_agent = DBAgent(name=self.config.name, **agent_values)
+            session.add(db_agent)
+        else:
+            for key, value in {**agent_values, "updated_at": datetime.utcnow()}.items():
+                setattr(db_agent, key, value)
+        session.flush()
+        
+        db_state = session.query(DBAgentState).filter(DBAgentState.agent_id == db_agent.id).first()
+        if db_state is None:
+            db_state = DBAgentState(agent_id=db_agent.id, **state_values)
+            session.add(db_state)
+        else:
+            for key, value in state_values.items():
+                setattr(db_state, key, value)
+        session.flush()
+        
+        return db_agent.id, db_state.id
+    
+    def _resolve_agent_id(self) -> Optional[int]:
+        """Return the agent's database id, looking it up once if initialization missed it.
+        
+        Blocking; call from a worker thread when on the event loop.
+        """
+        if self._db_agent_id is not None:
+            return self._db_agent_id
+        
+        with self._db_agent_lock:
+            if self._db_agent_id is None:
+                try:
+                    with get_db_session() as session:
+                        self._db_agent_id = session.execute(
+                            select(DBAgent.id).where(DBAgent.name == self.agent_name)
+                        ).scalar_one_or_none()
+                except Exception as e:
+                    logger.error("Failed to look up database id for %s: %s", self.agent_name, e)
+        return self._db_agent_id
+    
+    @property
+    def last_activity(self) -> datetime:
+        """Time of the last status change, built from the cached timestamp on read."""
+        return datetime.utcfromtimestamp(self.last_activity_ts)
+    
+    async def update_status(self, status: AgentStatus, task: Optional[str] = None):
+        """Update agent status and current task; the database copy is written back periodically."""
         self.status = status
         self.current_task = task
-        self.last_activity = datetime.utcnow()
+        self.last_activity_ts = time.time()
+        
+        if self._db_state_id is None:
+            return
+        
+        self._state_dirty = True
+        if self._state_flusher_task is None or self._state_flusher_task.done():
+            self._state_flusher_task = asyncio.create_task(self._state_flusher())
+    
+    async def _state_flusher(self):
+        """Write the latest status to the database at most once per STATE_FLUSH_INTERVAL."""
+        while True:
+            await asyncio.sleep(STATE_FLUSH_INTERVAL)
+            await self._flush_state_once()
+    
+    async def _flush_state_once(self):
+        """Write the current status if it changed since the last write."""
+        if not self._state_dirty:
+            return
+        
+        self._state_dirty = False
+        # Run the blocking write in a worker thread so the event loop stays free
+        await asyncio.to_thread(self._write_status, self.status, self.current_task, self.last_activity_ts)
+    
+    async def flush_state(self):
+        """Stop the state flusher and write any pending status change."""
+        if self._state_flusher_task is not None:
+            self._state_flusher_task.cancel()
+            try:
+                await self._state_flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._state_flusher_task = None
         
+        await self._flush_state_once()
+    
+    def mark_offline(self):
+        """Set the in-memory status to offline without scheduling a database write.
+        
+        Call flush_state() first; the caller is responsible for persisting the status.
+        """
+        self.status = AgentStatus.OFFLINE
+        self.current_task = None
+        self.last_activity_ts = time.time()
+    
+    def _write_status(self, status: AgentStatus, task: Optional[str], last_activity_ts: float):
+        """Persist the agent status to its agent_states row."""
         try:
             with get_db_session() as session:
-                db_agent = session.query(DBAgent).filter(DBAgent.name == self.agent_name).first()
-                if db_agent:
-                    db_state = session.query(DBAgentState).filter(
-                        DBAgentState.agent_id == db_agent.id
-                    ).first()
-                    
-                    if db_state:
-                        db_state.status = status.value
-                        db_state.current_task = task
-                        db_state.last_activity = self.last_activity
-                        session.commit()
+                session.execute(
+                    update(DBAgentState)
+                    .where(DBAgentState.id == self._db_state_id)
+                    .values(
+                        status=status.value,
+                        current_task=task,
+                        last_activity=datetime.utcfromtimestamp(last_activity_ts)
+                    )
+                )
+                session.commit()
                         
         except Exception as e:
-            logger.error(f"Failed to update status for {self.agent_name}: {e}")
+            logger.error("Failed to update status for %s: %s", self.agent_name, e)
     
     def log_message(self, message_type: MessageType, content: str, metadata: Optional[Dict[str, Any]] = None):
-        """Log a message to the database."""
-        try:
-            with get_db_session() as session:
-                db_agent = session.query(DBAgent).filter(DBAgent.name == self.agent_name).first()
-                if db_agent:
-                    from database.models import Message as DBMessage
-                    
-                    db_message = DBMessage(
-                        agent_id=db_agent.id,
-                        message_type=message_type.value,
-                        content=content,
-                        timestamp=datetime.utcnow(),
-                        message_metadata=metadata
-                    )
-                    session.add(db_message)
-                    session.commit()
-                    
-        except Exception as e:
-            logger.error(f"Failed to log message for {self.agent_name}: {e}")
+        """Queue a message for batched insertion into the database."""
+        if self._db_agent_id is None:
+            return
+        
+        _enqueue_row(_MESSAGE_INSERT, {
+            "agent_id": self._db_agent_id,
+            "message_type": message_type.value,
+            "content": content,
+            "message_metadata": metadata
+        })
     
     def log_task(self, task_request: TaskRequest, task_response: TaskResponse):
-        """Log a task to the database."""
+        """Queue a task for batched insertion into the database."""
+        if self._db_agent_id is None:
+            return
+        
+        _enqueue_row(_TASK_INSERT, {
+            "agent_id": self._db_agent_id,
+            "task_id": task_response.task_id,
+            "task_type": task_request.task_type,
+            "description": task_request.description,
+            "priority": task_request.priority,
+            "parameters": task_request.parameters,
+            "status": "completed" if task_response.success else "failed",
+            "result": task_response.result,
+            "error_message": task_response.error_message,
+            "execution_time": task_response.execution_time,
+            "created_at": task_request.created_at,
+            "completed_at": task_response.completed_at
+        })
+    
+    def _get_dispatcher(self) -> TaskDispatcher:
+        """Get the agent's task dispatcher, creating it on first use."""
+        if self._dispatcher is None:
+            self._dispatcher = TaskDispatcher(self, scorer=self.task_scorer)
+        return self._dispatcher
+    
+    async def submit(self, task_request: TaskRequest, priority: Optional[float] = None) -> TaskResponse:
+        """Run a task through the agent's priority queue and wait for its response.
+        
+        Higher priority runs first; it defaults to the task_scorer score.
+        """
+        return await self._get_dispatcher().submit(task_request, priority)
+    
+    def submit_task(self, task_request: TaskRequest) -> str:
+        """Queue a task on the agent's dispatcher and return its task id."""
+        if not task_request.task_id:
+            task_request.task_id = str(uuid.uuid4())
+        task_id = task_request.task_id
+        
+        future = self._get_dispatcher().submit(task_request)
+        
+        self._submitted_tasks[task_id] = {
+            "task_id": task_id,
+            "agent_name": self.agent_name,
+            "status": "pending",
+            "response": None
+        }
+        while len(self._submitted_tasks) > MAX_TRACKED_TASKS:
+            self._submitted_tasks.popitem(last=False)
+        
+        future.add_done_callback(lambda f: self._record_submitted_task(task_id, f))
+        return task_id
+    
+    def _record_submitted_task(self, task_id: str, future: asyncio.Future):
+        """Store the outcome of a dispatched task."""
+        entry = self._submitted_tasks.get(task_id)
+        if entry is None or future.cancelled():
+            return
+        
+        if future.exception() is not None:
+            entry["status"] = "failed"
+        else:
+            response = future.result()
+            entry["status"] = "completed" if response.success else "failed"
+            entry["response"] = response
+    
+    async def drain_tasks(self):
+        """Wait for dispatched tasks to finish and stop the dispatcher."""
+        if self._dispatcher is None:
+            return
+        
+        await self._dispatcher.join()
+        await self._dispatcher.stop()
+        self._dispatcher = None
+    
+    async def flush(self):
+        """Wait for background writes owned by the agent; subclasses extend this."""
+        pass
+    
+    def get_submitted_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status and response of a background task."""
+        return self._submitted_tasks.get(task_id)
+    
+    async def batch_process(
+        self,
+        task_requests: List[TaskRequest],
+        max_concurrent: Optional[int] = None,
+        on_progress: Optional[Callable[[BatchProgress], None]] = None
+    ) -> List[Union[TaskResponse, Exception]]:
+        """Process several tasks concurrently and return results in request order.
+        
+        At most max_concurrent tasks run at once (default: up to 4). Progress is
+        reported every second through on_progress, or logged when none is given.
+        Failed tasks appear in the result list as their exception.
+        """
+        if not task_requests:
+            return []
+        
+        semaphore = asyncio.Semaphore(max_concurrent or min(len(task_requests), 4))
+        progress = BatchProgress(agent_name=self.agent_name, total=len(task_requests))
+        started = time.time()
+        
+        def report():
+            progress.elapsed = time.time() - started
+            if on_progress:
+                on_progress(progress)
+            else:
+                logger.info(
+                    "Batch progress for %s: %d/%d done, %d failed",
+                    self.agent_name, progress.completed, progress.total, progress.failed
+                )
+        
+        async def run_one(task_request: TaskRequest) -> TaskResponse:
+            async with semaphore:
+                try:
+                    response = await self._process_task_impl(task_request)
+                except Exception:
+                    progress.failed += 1
+                    raise
+                finally:
+                    progress.completed += 1
+                if not response.success:
+                    progress.failed += 1
+                return response
+        
+        async def reporter():
+            while True:
+                await asyncio.sleep(1.0)
+                report()
+        
+        reporter_task = asyncio.create_task(reporter())
         try:
-            with get_db_session() as session:
-                db_agent = session.query(DBAgent).filter(DBAgent.name == self.agent_name).first()
-                if db_agent:
-                    db_task = DBTask(
-                        task_id=task_response.task_id,
-                        agent_id=db_agent.id,
-                        task_type=task_request.task_type,
-                        description=task_request.description,
-                        priority=task_request.priority,
-                        parameters=task_request.parameters,
-                        status="completed" if task_response.success else "failed",
-                        result=task_response.result,
-                        error_message=task_response.error_message,
-                        execution_time=task_response.execution_time,
-                        created_at=task_request.created_at,
-                        completed_at=task_response.completed_at
-                    )
-                    session.add(db_task)
-                    session.commit()
-                    
-        except Exception as e:
-            logger.error(f"Failed to log task for {self.agent_name}: {e}")
+            results = await asyncio.gather(
+                *(run_one(task_request) for task_request in task_requests),
+                return_exceptions=True
+            )
+        finally:
+            reporter_task.cancel()
+        
+        report()
+        return results
+    
+    def can_handle(self, task_type: str) -> bool:
+        """Whether the agent has dedicated handling for a task type."""
+        return True
+    
+    async def process_task_batch(self, task_requests: List[TaskRequest]) -> List[Union[TaskResponse, Exception]]:
+        """Process a group of tasks submitted together.
+        
+        The default runs them concurrently; agents that can serve a group in
+        one call may override this. Failed tasks appear as their exception.
+        """
+        return await asyncio.gather(
+            *(self._process_task_impl(task_request) for task_request in task_requests),
+            return_exceptions=True
+        )
+    
+    async def dispatch(self, task_request: TaskRequest) -> TaskResponse:
+        """Run a task for the dispatcher, whose log stage records it with log_task."""
+        return await self.execute_task(task_request)
     
-    @abstractmethod
     async def process_task(self, task_request: TaskRequest) -> TaskResponse:
-        """Process a task request and return a response."""
+        """Process a task request, record it and return the response."""
+        task_response = await self.execute_task(task_request)
+        self.log_task(task_request, task_response)
+        return task_response
+    
+    @abstractmethod
+    async def execute_task(self, task_request: TaskRequest) -> TaskResponse:
+        """Run a task request and return a response without recording the task."""
         pass
     
     @abstractmethod
@@ -179,21 +580,51 @@ class BaseAgent(ABC):
             "current_task": self.current_task,
             "memory_usage": self.memory_usage,
             "last_activity": self.last_activity.isoformat(),
-            "agent_metadata": self.metadata,
-            "config": {
-                "model": self.config.model,
-                "personality": self.config.personality,
-                "goal": self.config.goal
-            }
+            "agent_metadata": dict(self.metadata),
+            # Copied so callers cannot change the agent's cached config
+            "config": dict(self._state_config)
         }
     
     async def health_check(self) -> Dict[str, Any]:
-        """Perform a health check on the agent."""
+        """Perform a health check on the agent.
+        
+        A healthy result is reused for HEALTH_CHECK_TTL seconds, and concurrent
+        callers share a single LLM probe.
+        """
+        cached = self._fresh_health_result()
+        if cached is not None:
+            return cached
+        
+        async with self._health_lock:
+            # Another caller may have refreshed the result while we waited
+            cached = self._fresh_health_result()
+            if cached is not None:
+                return cached
+            return await self._probe_health()
+    
+    def _fresh_health_result(self) -> Optional[Dict[str, Any]]:
+        """Return the cached healthy result with live fields, if still fresh."""
+        if self._health_cache is None:
+            return None
+        
+        checked_at, result = self._health_cache
+        if time.monotonic() - checked_at >= HEALTH_CHECK_TTL:
+            return None
+        
+        return {
+            **result,
+            "current_status": self.status.value,
+            "last_activity": self.last_activity.isoformat(),
+            "memory_usage": self.memory_usage
+        }
+    
+    async def _probe_health(self) -> Dict[str, Any]:
+        """Check the agent by generating a test response."""
         try:
             # Test basic functionality
             test_response = await self.generate_response("Hello, this is a health check.")
             
-            return {
+            result = {
                 "status": "healthy",
                 "agent_name": self.agent_name,
                 "current_status": self.status.value,
@@ -201,9 +632,12 @@ class BaseAgent(ABC):
                 "last_activity": self.last_activity.isoformat(),
                 "memory_usage": self.memory_usage
             }
+            self._health_cache = (time.monotonic(), result)
+            return dict(result)
             
         except Exception as e:
-            logger.error(f"Health check failed for {self.agent_name}: {e}")
+            logger.error("Health check failed for %s: %s", self.agent_name, e)
+            self._health_cache = None
             return {
                 "status": "unhealthy",
                 "agent_name": self.agent_name,
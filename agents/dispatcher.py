@@ -0,0 +1,171 @@
+"""
+Staged task dispatcher for agents.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from shared.models import TaskRequest
+
+logger = logging.getLogger(__name__)
+
+# Multilevel feedback queue settings for the run stage
+QUANTUM = 5.0  # seconds a task may run before its task type is demoted
+MAX_LEVEL = 3  # lowest scheduling level
+AGING_INTERVAL = 30.0  # seconds between promotions of all pending tasks
+
+
+def _default_score(task_request: TaskRequest) -> float:
+    """Score a task by its requested priority."""
+    return task_request.priority
+
+
+class TaskDispatcher:
+    """Pipeline that moves tasks through init, run and log stages on bounded queues.
+
+    Each stage has its own worker pool, so recording finished tasks overlaps
+    with running the next ones instead of serializing behind them. The run
+    stage is a multilevel feedback queue ordered by (level, -score, seq), where
+    the score comes from the scorer (TaskRequest.priority by default):
+    task types that overrun QUANTUM are demoted a level, types that finish
+    within it are promoted back, and every AGING_INTERVAL all pending tasks
+    return to level 0 so nothing starves.
+    """
+
+    def __init__(
+        self,
+        agent: Any,
+        run_workers: int = 4,
+        maxsize: int = 100,
+        scorer: Optional[Callable[[TaskRequest], float]] = None
+    ):
+        self.agent = agent
+        self.scorer = scorer or _default_score
+        self.run_workers = run_workers
+        self.init_q: asyncio.Queue = asyncio.Queue(maxsize)
+        self.run_q: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize)
+        self.log_q: asyncio.Queue = asyncio.Queue(maxsize)
+        self._seq = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._type_levels: Dict[str, int] = {}
+
+    def start(self):
+        """Start the stage workers if they are not running."""
+        if self._workers:
+            return
+
+        self._workers = [asyncio.create_task(self._init_worker())]
+        self._workers.extend(
+            asyncio.create_task(self._run_worker()) for _ in range(self.run_workers)
+        )
+        self._workers.append(asyncio.create_task(self._log_worker()))
+        self._workers.append(asyncio.create_task(self._aging_worker()))
+
+    def submit(self, task_request: TaskRequest, priority: Optional[float] = None) -> asyncio.Future:
+        """Queue a task and return a future for its TaskResponse.
+
+        priority overrides the scorer for this task. Raises asyncio.QueueFull
+        when the pipeline is saturated.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.init_q.put_nowait((task_request, future, priority))
+        self.start()
+        return future
+
+    async def _init_worker(self):
+        """Assign ids and sequence numbers, then hand tasks to the run stage."""
+        while True:
+            task_request, future, priority = await self.init_q.get()
+            try:
+                if not task_request.task_id:
+                    task_request.task_id = str(uuid.uuid4())
+                if priority is None:
+                    priority = self.scorer(task_request)
+                level = self._type_levels.get(task_request.task_type, 0)
+                await self.run_q.put(
+                    (level, -priority, next(self._seq), time.time(), task_request, future)
+                )
+            finally:
+                self.init_q.task_done()
+
+    async def _run_worker(self):
+        """Run tasks on the agent and pass the outcome to the log stage."""
+        while True:
+            level, _, seq, queued_at, task_request, future = await self.run_q.get()
+            try:
+                started = time.perf_counter()
+                try:
+                    outcome = await self.agent.dispatch(task_request)
+                except Exception as e:
+                    outcome = e
+                self._update_level(task_request.task_type, time.perf_counter() - started)
+                await self.log_q.put((seq, queued_at, task_request, future, outcome))
+            finally:
+                self.run_q.task_done()
+
+    def _update_level(self, task_type: str, elapsed: float):
+        """Demote task types that overran the quantum and promote ones that did not."""
+        level = self._type_levels.get(task_type, 0)
+        if elapsed > QUANTUM:
+            level = min(level + 1, MAX_LEVEL)
+        else:
+            level = max(level - 1, 0)
+
+        if level:
+            self._type_levels[task_type] = level
+        else:
+            self._type_levels.pop(task_type, None)
+
+    async def _aging_worker(self):
+        """Periodically move every pending task back to the top level."""
+        while True:
+            await asyncio.sleep(AGING_INTERVAL)
+            pending = []
+            while not self.run_q.empty():
+                pending.append(self.run_q.get_nowait())
+                self.run_q.task_done()
+            for item in pending:
+                self.run_q.put_nowait((0, *item[1:]))
+
+    async def _log_worker(self):
+        """Record task outcomes with the agent's log_task and resolve the submitters' futures."""
+        while True:
+            seq, queued_at, task_request, future, outcome = await self.log_q.get()
+            try:
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        "Dispatched task %s failed for %s: %s",
+                        task_request.task_id, self.agent.agent_name, outcome
+                    )
+                    if not future.done():
+                        future.set_exception(outcome)
+                else:
+                    try:
+                        self.agent.log_task(task_request, outcome)
+                    except Exception as e:
+                        logger.error("Failed to log task %s: %s", task_request.task_id, e)
+                    logger.debug(
+                        "Dispatched task %s (#%d) finished in %.3fs",
+                        task_request.task_id, seq, time.time() - queued_at
+                    )
+                    if not future.done():
+                        future.set_result(outcome)
+            finally:
+                self.log_q.task_done()
+
+    async def join(self):
+        """Wait until every queued task has passed through all stages."""
+        await self.init_q.join()
+        await self.run_q.join()
+        await self.log_q.join()
+
+    async def stop(self):
+        """Cancel the stage workers."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -2,13 +2,23 @@
 Generic Agent implementation that can handle any personality and tools.
 """
 
+import ast
 import asyncio
+import functools
 import hashlib
+import math
+import operator
 import logging
+import random
+import re
+import reprlib
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Callable, Dict, List, Optional, Union
 from abc import abstractmethod
 
 from .base_agent import BaseAgent
@@ -18,16 +28,206 @@ from shared.models import (
 from database.models import CodeReview as DBCodeReview
 from database.memory_manager import memory_manager, MemoryType, MemoryCategory
 from shared.llm import llm_manager, LLMConfig, LLMMessage
+from shared.semantic_cache import SemanticCache
+from shared.serialization import dumps as json_dumps
 
 logger = logging.getLogger(__name__)
 
+REVIEW_CACHE_SIZE = 512  # code reviews kept in memory per agent
+MEMORY_QUEUE_SIZE = 1000  # pending task memory writes per agent
+MEMORY_WRITE_RETRIES = 3
+LLM_BATCH_WINDOW = 0.025  # seconds to collect prompts into one LLM batch
+LLM_BATCH_SIZE = 16  # prompts per LLM batch
+
+# Fallback intent keywords, matched as substrings; lower level wins
+_INTENT_LEVELS = {
+    "code": 0, "review": 0,
+    "help": 1, "assist": 1,
+    "analyze": 2, "examine": 2,
+}
+_INTENT_RE = re.compile("|".join(_INTENT_LEVELS), re.IGNORECASE)
+
+# Code patterns looked for by _perform_code_analysis
+_CODE_SIGNATURES = re.compile(r"eval\(|print\(|logging")
+_CODE_SIGNATURE_COUNT = 3
+
+# Semantic memories stored from dict task results:
+# (result key, category, extra tags, content formatter returning None to skip)
+_MEMORY_EXTRACTORS = (
+    ("review", MemoryCategory.KNOWLEDGE, ("code_review", "knowledge"),
+     lambda result: f"Code review result: {result.get('review', '')[:200]}..."),
+    ("suggestions", MemoryCategory.SOLUTION, ("suggestions", "solutions"),
+     lambda result: f"Suggestions made: {', '.join(result['suggestions'])}" if result["suggestions"] else None),
+)
+
+# Bounded repr for task results: element counts and nesting are capped so
+# large results are never fully rendered just to be cut to a few hundred chars
+_RESULT_REPR = reprlib.Repr()
+_RESULT_REPR.maxlevel = 3
+_RESULT_REPR.maxlist = _RESULT_REPR.maxtuple = _RESULT_REPR.maxset = 5
+_RESULT_REPR.maxdict = 5
+_RESULT_REPR.maxstring = _RESULT_REPR.maxother = 200
+
+
+def _truncated_text(value: Any, limit: int) -> str:
+    """Render a value as at most limit characters without building its full text."""
+    if isinstance(value, str):
+        return value[:limit]
+    return _RESULT_REPR.repr(value)[:limit]
+
+HASH_CHUNK_CHARS = 64 * 1024  # characters encoded per step when hashing large code
+
+
+def _hash_code(code: Union[str, bytes]) -> bytes:
+    """Hash code for the review cache without copying large inputs whole.
+    
+    BLAKE2b is faster than SHA-256 and its raw 32-byte digest fills the
+    binary code_hash column. Large strings are encoded and hashed in chunks,
+    which gives the same digest as hashing code.encode() in one go.
+    """
+    hasher = hashlib.blake2b(digest_size=32)
+    if isinstance(code, bytes):
+        hasher.update(memoryview(code))
+    elif len(code) <= HASH_CHUNK_CHARS:
+        hasher.update(code.encode())
+    else:
+        for start in range(0, len(code), HASH_CHUNK_CHARS):
+            hasher.update(code[start:start + HASH_CHUNK_CHARS].encode())
+    return hasher.digest()
+
+# Operators, functions and constants allowed in math_calculation expressions
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+_MATH_FUNCTIONS = {
+    "abs": abs, "round": round, "min": min, "max": max,
+    "sqrt": math.sqrt, "exp": math.exp, "log": math.log, "log10": math.log10,
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "floor": math.floor, "ceil": math.ceil,
+}
+_MATH_CONSTANTS = {"pi": math.pi, "e": math.e}
+MAX_INTEGER_BITS = 10000  # largest integer result; keeps "9**9**9"-style inputs from running forever
+
+
+def _evaluate_node(node: ast.AST) -> Any:
+    """Evaluate an arithmetic AST node, rejecting anything outside the allowed subset."""
+    if isinstance(node, ast.Expression):
+        return _evaluate_node(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        left = _evaluate_node(node.left)
+        right = _evaluate_node(node.right)
+        # Reject integer powers before computing them when the result has at
+        # least (bits of base - 1) * exponent bits; anything smaller is cheap
+        if (isinstance(node.op, ast.Pow) and isinstance(left, int) and isinstance(right, int)
+                and right > 0 and (abs(left).bit_length() - 1) * right > MAX_INTEGER_BITS):
+            raise ValueError("Result too large")
+        result = _BINARY_OPERATORS[type(node.op)](left, right)
+        if isinstance(result, int) and result.bit_length() > MAX_INTEGER_BITS:
+            raise ValueError("Result too large")
+        return result
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        return _UNARY_OPERATORS[type(node.op)](_evaluate_node(node.operand))
+    if isinstance(node, ast.Name) and node.id in _MATH_CONSTANTS:
+        return _MATH_CONSTANTS[node.id]
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in _MATH_FUNCTIONS and not node.keywords):
+        return _MATH_FUNCTIONS[node.func.id](*(_evaluate_node(arg) for arg in node.args))
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate_expression(expression: str) -> Any:
+    """Safely evaluate an arithmetic expression; results are cached per expression."""
+    return _evaluate_node(ast.parse(expression, mode="eval"))
+
 
 class GenericAgent(BaseAgent):
     """Generic agent that can handle any personality and tools based on configuration."""
     
+    # Task types handled by tools, and the methods implementing them
+    _TOOL_METHOD_NAMES = (
+        ("code_review", "_tool_code_review"),
+        ("text_analysis", "_tool_text_analysis"),
+        ("data_processing", "_tool_data_processing"),
+        ("file_operations", "_tool_file_operations"),
+        ("web_search", "_tool_web_search"),
+        ("math_calculation", "_tool_math_calculation"),
+        ("text_generation", "_tool_text_generation"),
+    )
+    _DEVELOPER_TOOL_METHOD_NAMES = (
+        ("code_generation", "_tool_code_generation"),
+        ("generate_code", "_tool_code_generation"),
+    )
+    
     def __init__(self, agent_name: str):
         super().__init__(agent_name)
+        # Lowercased config text and fallback responses, built once per agent
+        self._personality_lc = self.config.personality.lower()
+        self._job_description_lc = self.config.job_description.lower()
+        self._goal_lc = self.config.goal.lower()
+        self._rng = random.Random()
+        # Constant start of every personality prompt
+        self._prompt_prefix = "\n\n".join([
+            f"System: {self.config.system_prompt}",
+            f"Personality: {self.config.personality}",
+            f"Goal: {self.config.goal}",
+            f"Job Description: {self.config.job_description}"
+        ])
+        self._code_responses = (
+            f"As {self._personality_lc}, I'm ready to help with code analysis and review. Please share the code you'd like me to examine.",
+            f"Based on my expertise in {self._job_description_lc}, I can provide detailed code review and suggestions. What would you like me to look at?",
+            f"I'm here to ensure code quality and best practices. Please provide the code you'd like me to review.",
+            f"With my focus on {self._goal_lc}, I'm ready to analyze your code and provide constructive feedback."
+        )
+        self._help_responses = (
+            f"Hello! I'm {self.agent_name}, and I'm here to help with {self._job_description_lc}. How can I assist you today?",
+            f"As {self._personality_lc}, I'm ready to help you with {self._goal_lc}. What do you need assistance with?",
+            f"I'm here to support you with {self._job_description_lc}. What would you like to work on?",
+            f"With my expertise in {self._personality_lc}, I can help you achieve {self._goal_lc}. What can I do for you?"
+        )
+        self._analysis_responses = (
+            f"I'm ready to provide a thorough analysis based on my expertise in {self._job_description_lc}. Please share what you'd like me to examine.",
+            f"As {self._personality_lc}, I can analyze this from multiple angles. What specific aspects would you like me to focus on?",
+            f"I'll apply my knowledge of {self._goal_lc} to provide a comprehensive analysis. Please provide the details.",
+            f"With my background in {self._personality_lc}, I can help you analyze this effectively. What should I look at?"
+        )
+        self._general_responses = (
+            f"Hello! I'm {self.agent_name}, {self._personality_lc}. I'm here to help with {self._job_description_lc}.",
+            f"As {self._personality_lc}, I'm passionate about {self._goal_lc}. How can I help you today?",
+            f"I'm {self.agent_name}, and I specialize in {self._job_description_lc}. What would you like to discuss?",
+            f"With my expertise in {self._personality_lc}, I'm ready to assist you with {self._goal_lc}. What's on your mind?"
+        )
+        
         self.tools: Dict[str, Callable] = {}
+        # In-memory LRU in front of the database review cache
+        self._review_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._review_cache_lock = threading.Lock()
+        self.review_cache_hits = 0
+        self.review_cache_misses = 0
+        # Prompts waiting for the next LLM batch
+        self._llm_batch: List[tuple] = []
+        self._llm_batch_task: Optional[asyncio.Task] = None
+        # Background task memory writes, started on first use
+        self._memory_queue: Optional[asyncio.Queue] = None
+        self._memory_writer_task: Optional[asyncio.Task] = None
+        # Backoff waits before a failed task memory is queued again
+        self._memory_retries: set = set()
+        self._response_cache = SemanticCache(
+            threshold=self.config.semantic_cache_threshold,
+            ttl=self.config.semantic_cache_ttl
+        ) if self.config.semantic_cache_enabled else None
         self._register_default_tools()
         self._setup_llm_client()
         logger.info(f"Generic Agent '{self.agent_name}' initialized with personality: {self.config.personality}")
@@ -43,7 +243,8 @@ class GenericAgent(BaseAgent):
                 api_key=self.config.llm_api_key,
                 base_url=self.config.llm_base_url,
                 max_tokens=self.config.max_context_length,
-                temperature=0.7
+                temperature=0.7,
+                max_concurrency=self.config.max_concurrent_llm_calls
             )
             
             # Register client with agent name as identifier
@@ -60,51 +261,47 @@ class GenericAgent(BaseAgent):
     
     def _register_default_tools(self):
         """Register default tools that all agents can use."""
-        self.tools = {
-            "code_review": self._tool_code_review,
-            "text_analysis": self._tool_text_analysis,
-            "data_processing": self._tool_data_processing,
-            "file_operations": self._tool_file_operations,
-            "web_search": self._tool_web_search,
-            "math_calculation": self._tool_math_calculation,
-            "text_generation": self._tool_text_generation,
-        }
+        tool_methods = dict(self._TOOL_METHOD_NAMES)
         
         # Add specialized tools for agentic_software_developer
         if self.agent_name == "agentic_software_developer":
-            self.tools.update({
-                "code_generation": self._tool_code_generation,
-                "generate_code": self._tool_code_generation,
-            })
+            tool_methods.update(self._DEVELOPER_TOOL_METHOD_NAMES)
+        
+        self.tools = {name: getattr(self, method) for name, method in tool_methods.items()}
     
-    async def process_task(self, task_request: TaskRequest) -> TaskResponse:
-        """Process a task request using the agent's configured personality and available tools."""
+    def can_handle(self, task_type: str) -> bool:
+        """Whether the task type maps to a tool or a built-in handler rather than the generic fallback."""
+        return task_type in self.tools or task_type in ("generate_response", "conversation")
+    
+    async def execute_task(self, task_request: TaskRequest) -> TaskResponse:
+        """Run a task request using the agent's configured personality and available tools."""
         start_time = time.time()
         task_id = task_request.task_id or str(uuid.uuid4())
         
         try:
-            self.update_status(AgentStatus.BUSY, f"Processing {task_request.task_type}")
+            await self.update_status(AgentStatus.BUSY, f"Processing {task_request.task_type}")
             
-            # Check if this is a tool-based task
-            if task_request.task_type in self.tools:
-                result = await self._execute_tool(task_request.task_type, task_request.parameters or {})
-            elif task_request.task_type == "generate_response":
-                # For agentic_software_developer, check if this is a code generation request
-                if self.agent_name == "agentic_software_developer" and any(keyword in task_request.description.lower() for keyword in ["generate", "create", "write", "code", "function", "class"]):
-                    # Treat as code generation task
-                    params = task_request.parameters or {}
-                    params["description"] = task_request.description
-                    result = await self._execute_tool("code_generation", params)
-                else:
-                    result = await self.generate_response(
-                        task_request.description,
-                        task_request.parameters.get("context") if task_request.parameters else None
-                    )
-            elif task_request.task_type == "conversation":
-                result = await self._handle_conversation(task_request.parameters or {})
-            else:
-                # Generic task processing using the agent's personality
-                result = await self._process_generic_task(task_request)
+            match task_request.task_type:
+                case task_type if task_type in self.tools:
+                    # Tool-based task
+                    result = await self._execute_tool(task_type, task_request.parameters or {})
+                case "generate_response":
+                    # For agentic_software_developer, check if this is a code generation request
+                    if self.agent_name == "agentic_software_developer" and any(keyword in task_request.description.lower() for keyword in ["generate", "create", "write", "code", "function", "class"]):
+                        # Treat as code generation task
+                        params = task_request.parameters or {}
+                        params["description"] = task_request.description
+                        result = await self._execute_tool("code_generation", params)
+                    else:
+                        result = await self.generate_response(
+                            task_request.description,
+                            task_request.parameters.get("context") if task_request.parameters else None
+                        )
+                case "conversation":
+                    result = await self._handle_conversation(task_request.parameters or {})
+                case _:
+                    # Generic task processing using the agent's personality
+                    result = await self._process_generic_task(task_request)
             
             execution_time = time.time() - start_time
             task_response = TaskResponse(
@@ -115,9 +312,6 @@ class GenericAgent(BaseAgent):
                 execution_time=execution_time
             )
             
-            # Log the task
-            self.log_task(task_request, task_response)
-            
             # Log the message
             self.log_message(
                 MessageType.ASSISTANT,
@@ -125,11 +319,11 @@ class GenericAgent(BaseAgent):
                 {"task_id": task_id, "execution_time": execution_time}
             )
             
-            # Store memory about this task
+            # Store memory about this task in the background
             if self.config.memory_enabled:
-                await self._store_task_memory(task_request, task_response, result)
+                self._queue_task_memory(task_request, task_response, result)
             
-            self.update_status(AgentStatus.IDLE)
+            await self.update_status(AgentStatus.IDLE)
             return task_response
             
         except Exception as e:
@@ -144,9 +338,6 @@ class GenericAgent(BaseAgent):
                 execution_time=execution_time
             )
             
-            # Log the failed task
-            self.log_task(task_request, task_response)
-            
             # Log the error message
             self.log_message(
                 MessageType.ERROR,
@@ -154,7 +345,7 @@ class GenericAgent(BaseAgent):
                 {"task_id": task_id, "task_type": task_request.task_type}
             )
             
-            self.update_status(AgentStatus.ERROR, f"Failed: {task_request.task_type}")
+            await self.update_status(AgentStatus.ERROR, f"Failed: {task_request.task_type}")
             return task_response
     
     async def generate_response(self, input_text: str, context: Optional[str] = None) -> str:
@@ -178,14 +369,32 @@ class GenericAgent(BaseAgent):
             self.log_message(MessageType.ERROR, error_response)
             return error_response
     
+    @classmethod
+    async def gather_responses(
+        cls,
+        agents: List["GenericAgent"],
+        prompts: List[str],
+        max_concurrency: int = 4
+    ) -> List[Any]:
+        """Generate responses from several agents concurrently.
+        
+        Returns one entry per (agent, prompt) pair, in order; failed calls
+        appear as their exception. At most max_concurrency calls run at once.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate(agent: "GenericAgent", prompt: str) -> str:
+            async with semaphore:
+                return await agent.generate_response(prompt)
+        
+        return await asyncio.gather(
+            *[generate(agent, prompt) for agent, prompt in zip(agents, prompts)],
+            return_exceptions=True
+        )
+    
     def _build_personality_prompt(self, input_text: str, context: Optional[str] = None) -> str:
         """Build a prompt that incorporates the agent's personality."""
-        prompt_parts = [
-            f"System: {self.config.system_prompt}",
-            f"Personality: {self.config.personality}",
-            f"Goal: {self.config.goal}",
-            f"Job Description: {self.config.job_description}"
-        ]
+        prompt_parts = [self._prompt_prefix]
         
         if context:
             prompt_parts.append(f"Context: {context}")
@@ -199,6 +408,13 @@ class GenericAgent(BaseAgent):
         """Generate a response based on the agent's personality."""
         # Try to use LLM if available
         if hasattr(self, 'llm_client_name') and self.llm_client_name:
+            # Near-identical questions in the same context reuse an earlier answer
+            cache_key = f"{context or ''}\n{input_text}"
+            if self._response_cache:
+                cached_response = self._response_cache.get(cache_key)
+                if cached_response is not None:
+                    return cached_response
+            
             try:
                 # Create messages for LLM
                 messages = [
@@ -206,14 +422,11 @@ class GenericAgent(BaseAgent):
                     LLMMessage(role="user", content=input_text)
                 ]
                 
-                # Generate response using LLM
-                response = await llm_manager.generate_response(
-                    client_name=self.llm_client_name,
-                    messages=messages,
-                    conversation_id=f"{self.agent_name}_conversation",
-                    include_history=True
-                )
+                # Generate response using LLM, batched with concurrent prompts
+                response = await self._batched_llm_call(messages)
                 
+                if self._response_cache:
+                    self._response_cache.put(cache_key, response)
                 return response
                 
             except Exception as e:
@@ -221,65 +434,73 @@ class GenericAgent(BaseAgent):
                 # Fall back to personality-based responses
         
         # Fallback to personality-based response generation
-        input_lower = input_text.lower()
+        # One case-insensitive scan finds the highest-priority intent keyword
+        intent = None
+        for match in _INTENT_RE.finditer(input_text):
+            level = _INTENT_LEVELS[match.group().lower()]
+            if intent is None or level < intent:
+                intent = level
+                if level == 0:
+                    break
         
         # Generate response based on personality and input type
-        if "code" in input_lower or "review" in input_lower:
+        if intent == 0:
             return self._generate_code_related_response(input_text, context)
-        elif "help" in input_lower or "assist" in input_lower:
+        elif intent == 1:
             return self._generate_help_response(input_text, context)
-        elif "analyze" in input_lower or "examine" in input_lower:
+        elif intent == 2:
             return self._generate_analysis_response(input_text, context)
         else:
             return self._generate_general_response(input_text, context)
     
     def _generate_code_related_response(self, input_text: str, context: Optional[str] = None) -> str:
         """Generate a code-related response based on personality."""
-        responses = [
-            f"As {self.config.personality.lower()}, I'm ready to help with code analysis and review. Please share the code you'd like me to examine.",
-            f"Based on my expertise in {self.config.job_description.lower()}, I can provide detailed code review and suggestions. What would you like me to look at?",
-            f"I'm here to ensure code quality and best practices. Please provide the code you'd like me to review.",
-            f"With my focus on {self.config.goal.lower()}, I'm ready to analyze your code and provide constructive feedback."
-        ]
-        
-        import random
-        return random.choice(responses)
+        return self._rng.choice(self._code_responses)
     
     def _generate_help_response(self, input_text: str, context: Optional[str] = None) -> str:
         """Generate a help response based on personality."""
-        responses = [
-            f"Hello! I'm {self.agent_name}, and I'm here to help with {self.config.job_description.lower()}. How can I assist you today?",
-            f"As {self.config.personality.lower()}, I'm ready to help you with {self.config.goal.lower()}. What do you need assistance with?",
-            f"I'm here to support you with {self.config.job_description.lower()}. What would you like to work on?",
-            f"With my expertise in {self.config.personality.lower()}, I can help you achieve {self.config.goal.lower()}. What can I do for you?"
-        ]
-        
-        import random
-        return random.choice(responses)
+        return self._rng.choice(self._help_responses)
     
     def _generate_analysis_response(self, input_text: str, context: Optional[str] = None) -> str:
         """Generate an analysis response based on personality."""
-        responses = [
-            f"I'm ready to provide a thorough analysis based on my expertise in {self.config.job_description.lower()}. Please share what you'd like me to examine.",
-            f"As {self.config.personality.lower()}, I can analyze this from multiple angles. What specific aspects would you like me to focus on?",
-            f"I'll apply my knowledge of {self.config.goal.lower()} to provide a comprehensive analysis. Please provide the details.",
-            f"With my background in {self.config.personality.lower()}, I can help you analyze this effectively. What should I look at?"
-        ]
-        
-        import random
-        return random.choice(responses)
+        return self._rng.choice(self._analysis_responses)
     
     def _generate_general_response(self, input_text: str, context: Optional[str] = None) -> str:
         """Generate a general response based on personality."""
-        responses = [
-            f"Hello! I'm {self.agent_name}, {self.config.personality.lower()}. I'm here to help with {self.config.job_description.lower()}.",
-            f"As {self.config.personality.lower()}, I'm passionate about {self.config.goal.lower()}. How can I help you today?",
-            f"I'm {self.agent_name}, and I specialize in {self.config.job_description.lower()}. What would you like to discuss?",
-            f"With my expertise in {self.config.personality.lower()}, I'm ready to assist you with {self.config.goal.lower()}. What's on your mind?"
-        ]
-        
-        import random
-        return random.choice(responses)
+        return self._rng.choice(self._general_responses)
+    
+    async def _batched_llm_call(self, messages: List[LLMMessage]) -> str:
+        """Queue a prompt for the next LLM batch and wait for its response."""
+        future = asyncio.get_running_loop().create_future()
+        self._llm_batch.append((messages, future))
+        if self._llm_batch_task is None or self._llm_batch_task.done():
+            self._llm_batch_task = asyncio.create_task(self._flush_llm_batches())
+        return await future
+    
+    async def _flush_llm_batches(self):
+        """Send prompts collected during the batch window, LLM_BATCH_SIZE at a time."""
+        await asyncio.sleep(LLM_BATCH_WINDOW)
+        while self._llm_batch:
+            batch = self._llm_batch[:LLM_BATCH_SIZE]
+            self._llm_batch = self._llm_batch[LLM_BATCH_SIZE:]
+            try:
+                responses = await llm_manager.generate_response_batch(
+                    client_name=self.llm_client_name,
+                    message_lists=[messages for messages, _ in batch],
+                    conversation_id=f"{self.agent_name}_conversation",
+                    include_history=True,
+                    return_exceptions=True
+                )
+            except Exception as e:
+                responses = [e] * len(batch)
+            
+            for (_, future), response in zip(batch, responses):
+                if future.done():
+                    continue
+                if isinstance(response, BaseException):
+                    future.set_exception(response)
+                else:
+                    future.set_result(response)
     
     async def _execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a specific tool."""
@@ -326,13 +547,11 @@ class GenericAgent(BaseAgent):
         if not messages:
             return "No previous conversation."
         
-        summary_parts = []
-        for msg in messages[-5:]:  # Last 5 messages
-            role = msg.get("role", "unknown")
-            content = msg.get("content", "")[:100]  # First 100 chars
-            summary_parts.append(f"{role}: {content}...")
-        
-        return "\n".join(summary_parts)
+        # Last 5 messages, first 100 chars of each
+        return "\n".join(
+            f"{msg.get('role', 'unknown')}: {msg.get('content', '')[:100]}..."
+            for msg in messages[-5:]
+        )
     
     # Tool implementations
     async def _tool_code_review(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -346,10 +565,10 @@ class GenericAgent(BaseAgent):
             raise ValueError("No code provided for review")
         
         # Generate code hash for caching
-        code_hash = hashlib.sha256(code.encode()).hexdigest()
+        code_hash = _hash_code(code)
         
         # Check if we have a cached review
-        cached_review = self._get_cached_review(code_hash)
+        cached_review = await self._get_cached_review(code_hash)
         if cached_review:
             return cached_review
         
@@ -357,7 +576,7 @@ class GenericAgent(BaseAgent):
         review_result = self._perform_code_analysis(code, language, context, focus_areas)
         
         # Cache the review
-        self._cache_review(code_hash, language, review_result)
+        await self._cache_review(code_hash, language, review_result)
         
         return review_result
     
@@ -378,11 +597,11 @@ class GenericAgent(BaseAgent):
         }
         
         # Add personality-based insights
-        if "security" in self.config.personality.lower():
+        if "security" in self._personality_lc:
             analysis["insights"].append("Security-focused analysis provided")
-        if "quality" in self.config.personality.lower():
+        if "quality" in self._personality_lc:
             analysis["insights"].append("Quality-focused analysis provided")
-        if "performance" in self.config.personality.lower():
+        if "performance" in self._personality_lc:
             analysis["insights"].append("Performance-focused analysis provided")
         
         return analysis
@@ -418,7 +637,7 @@ class GenericAgent(BaseAgent):
         return {
             "query": query,
             "agent_personality": self.config.personality,
-            "result": f"Search results for '{query}' based on {self.config.personality.lower()} expertise"
+            "result": f"Search results for '{query}' based on {self._personality_lc} expertise"
         }
     
     async def _tool_math_calculation(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -426,7 +645,7 @@ class GenericAgent(BaseAgent):
         expression = parameters.get("expression", "")
         
         try:
-            result = eval(expression)  # In production, use a safer math library
+            result = _evaluate_expression(expression)
             return {
                 "expression": expression,
                 "result": result,
@@ -448,7 +667,7 @@ class GenericAgent(BaseAgent):
             "prompt": prompt,
             "style": style,
             "agent_personality": self.config.personality,
-            "generated_text": f"Generated text in {style} style based on {self.config.personality.lower()} expertise"
+            "generated_text": f"Generated text in {style} style based on {self._personality_lc} expertise"
         }
     
     async def _tool_code_generation(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -623,23 +842,30 @@ def {function_name or "main_function"}():
             "confidence": 1.0
         }
         
-        lines = code.split('\n')
-        analysis["review"] = f"Reviewed {len(lines)} lines of {language} code using {self.config.personality.lower()} expertise."
+        line_count = code.count('\n') + 1
+        analysis["review"] = f"Reviewed {line_count} lines of {language} code using {self._personality_lc} expertise."
+        
+        # One pass over the code finds every signature the checks below need
+        signatures = set()
+        for match in _CODE_SIGNATURES.finditer(code):
+            signatures.add(match.group())
+            if len(signatures) == _CODE_SIGNATURE_COUNT:
+                break
         
         # Add personality-specific analysis
-        if "security" in self.config.personality.lower():
+        if "security" in self._personality_lc:
             analysis["suggestions"].append("Consider security implications of user input handling")
-            if "eval(" in code:
+            if "eval(" in signatures:
                 analysis["issues"].append("Potential security risk: eval() usage detected")
         
-        if "performance" in self.config.personality.lower():
+        if "performance" in self._personality_lc:
             analysis["suggestions"].append("Review for potential performance bottlenecks")
-            if len(lines) > 100:
+            if line_count > 100:
                 analysis["issues"].append("Large function detected - consider breaking into smaller functions")
         
-        if "quality" in self.config.personality.lower():
+        if "quality" in self._personality_lc:
             analysis["suggestions"].append("Ensure code follows consistent formatting and naming conventions")
-            if "print(" in code and "logging" not in code:
+            if "print(" in signatures and "logging" not in signatures:
                 analysis["suggestions"].append("Consider using logging instead of print statements")
         
         # Calculate score based on issues found
@@ -673,29 +899,48 @@ def {function_name or "main_function"}():
         
         return analysis
     
-    def _get_cached_review(self, code_hash: str) -> Optional[Dict[str, Any]]:
-        """Get a cached review from the database."""
+    async def _get_cached_review(self, code_hash: bytes) -> Optional[Dict[str, Any]]:
+        """Get a cached review from memory, falling back to the database."""
+        with self._review_cache_lock:
+            cached_review = self._review_cache.get(code_hash)
+            if cached_review is not None:
+                self._review_cache.move_to_end(code_hash)
+                self.review_cache_hits += 1
+                return dict(cached_review)
+            self.review_cache_misses += 1
+        
+        # Query in a worker thread so the event loop is not blocked
+        review = await asyncio.to_thread(self._load_review, code_hash)
+        if review is None:
+            return None
+        
+        self._remember_review(code_hash, review)
+        return dict(review)
+    
+    def _load_review(self, code_hash: bytes) -> Optional[Dict[str, Any]]:
+        """Load a cached review from the database."""
         try:
             from database.manager import get_db_session
-            from database.models import Agent as DBAgent
+            
+            agent_id = self._resolve_agent_id()
+            if agent_id is None:
+                return None
             
             with get_db_session() as session:
-                db_agent = session.query(DBAgent).filter(DBAgent.name == self.agent_name).first()
-                if db_agent:
-                    cached_review = session.query(DBCodeReview).filter(
-                        DBCodeReview.agent_id == db_agent.id,
-                        DBCodeReview.code_hash == code_hash
-                    ).first()
-                    
-                    if cached_review:
-                        return {
-                            "review": cached_review.review,
-                            "suggestions": cached_review.suggestions or [],
-                            "issues": cached_review.issues or [],
-                            "score": cached_review.score,
-                            "confidence": cached_review.confidence,
-                            "cached": True
-                        }
+                cached_review = session.query(DBCodeReview).filter(
+                    DBCodeReview.agent_id == agent_id,
+                    DBCodeReview.code_hash == code_hash
+                ).first()
+                
+                if cached_review:
+                    return {
+                        "review": cached_review.review,
+                        "suggestions": cached_review.suggestions or [],
+                        "issues": cached_review.issues or [],
+                        "score": cached_review.score,
+                        "confidence": cached_review.confidence,
+                        "cached": True
+                    }
             
             return None
             
@@ -703,31 +948,45 @@ def {function_name or "main_function"}():
             logger.error(f"Failed to get cached review: {e}")
             return None
     
-    def _cache_review(self, code_hash: str, language: str, review_result: Dict[str, Any]):
-        """Cache a review result in the database."""
+    async def _cache_review(self, code_hash: bytes, language: str, review_result: Dict[str, Any]):
+        """Cache a review result in memory and, from a worker thread, in the database."""
+        self._remember_review(code_hash, {**review_result, "cached": True})
+        await asyncio.to_thread(self._save_review, code_hash, language, review_result)
+    
+    def _save_review(self, code_hash: bytes, language: str, review_result: Dict[str, Any]):
+        """Store a review result in the database."""
         try:
             from database.manager import get_db_session
-            from database.models import Agent as DBAgent
+            
+            agent_id = self._resolve_agent_id()
+            if agent_id is None:
+                return
             
             with get_db_session() as session:
-                db_agent = session.query(DBAgent).filter(DBAgent.name == self.agent_name).first()
-                if db_agent:
-                    db_review = DBCodeReview(
-                        agent_id=db_agent.id,
-                        code_hash=code_hash,
-                        language=language,
-                        review=review_result["review"],
-                        suggestions=review_result.get("suggestions", []),
-                        issues=review_result.get("issues", []),
-                        score=review_result.get("score"),
-                        confidence=review_result.get("confidence", 1.0)
-                    )
-                    session.add(db_review)
-                    session.commit()
+                db_review = DBCodeReview(
+                    agent_id=agent_id,
+                    code_hash=code_hash,
+                    language=language,
+                    review=review_result["review"],
+                    suggestions=review_result.get("suggestions", []),
+                    issues=review_result.get("issues", []),
+                    score=review_result.get("score"),
+                    confidence=review_result.get("confidence", 1.0)
+                )
+                session.add(db_review)
+                session.commit()
                     
         except Exception as e:
             logger.error(f"Failed to cache review: {e}")
     
+    def _remember_review(self, code_hash: bytes, review: Dict[str, Any]):
+        """Store a review in the in-memory LRU, evicting the oldest entry when full."""
+        with self._review_cache_lock:
+            self._review_cache[code_hash] = review
+            self._review_cache.move_to_end(code_hash)
+            if len(self._review_cache) > REVIEW_CACHE_SIZE:
+                self._review_cache.popitem(last=False)
+    
     async def summarize_memory(self, memory_type: Optional[str] = None, limit: int = 20) -> str:
         """Summarize the agent's memory using the LLM for human readability."""
         # Retrieve memories (limit to prevent long processing)
@@ -763,72 +1022,139 @@ def {function_name or "main_function"}():
             logger.error(f"Failed to generate memory summary: {e}")
             return f"Error generating summary. Found {len(memories)} memories."
     
-    async def _store_task_memory(self, task_request: TaskRequest, task_response: TaskResponse, result: Any) -> None:
-        """Store memory about a completed task."""
+    def _queue_task_memory(self, task_request: TaskRequest, task_response: TaskResponse, result: Any):
+        """Queue a task memory write, dropping it if the queue is full."""
+        if self._memory_queue is None:
+            self._memory_queue = asyncio.Queue(MEMORY_QUEUE_SIZE)
+        if self._memory_writer_task is None or self._memory_writer_task.done():
+            self._memory_writer_task = asyncio.create_task(self._memory_writer())
+        
         try:
-            # Store episodic memory about the task
-            task_content = f"Task: {task_request.task_type} - {task_request.description}"
-            if task_request.parameters:
-                task_content += f" | Parameters: {task_request.parameters}"
-            
-            task_context = f"Agent: {self.agent_name}, Execution time: {task_response.execution_time}s, Success: {task_response.success}"
-            
-            # Store the task memory
-            memory_manager.store_memory(
-                agent_name=self.agent_name,
-                memory_type=MemoryType.EPISODIC,
-                memory_category=MemoryCategory.TASK,
-                content=task_content,
-                context=task_context,
-                tags=[task_request.task_type, "task_execution"],
-                importance=0.7 if task_response.success else 0.9,  # Failed tasks are more important to remember
-                confidence=1.0
-            )
-            
-            # Store semantic memory about the result if it's significant
-            if task_response.success and result:
-                if isinstance(result, dict):
-                    # Extract key insights from the result
-                    if "review" in result:
-                        review_content = f"Code review result: {result.get('review', '')[:200]}..."
-                        memory_manager.store_memory(
-                            agent_name=self.agent_name,
-                            memory_type=MemoryType.SEMANTIC,
-                            memory_category=MemoryCategory.KNOWLEDGE,
-                            content=review_content,
-                            context=f"From {task_request.task_type} task",
-                            tags=[task_request.task_type, "code_review", "knowledge"],
-                            importance=0.8,
-                            confidence=1.0
-                        )
-                    
-                    if "suggestions" in result and result["suggestions"]:
-                        suggestions_content = f"Suggestions made: {', '.join(result['suggestions'])}"
-                        memory_manager.store_memory(
-                            agent_name=self.agent_name,
-                            memory_type=MemoryType.SEMANTIC,
-                            memory_category=MemoryCategory.SOLUTION,
-                            content=suggestions_content,
-                            context=f"From {task_request.task_type} task",
-                            tags=[task_request.task_type, "suggestions", "solutions"],
-                            importance=0.8,
-                            confidence=1.0
-                        )
-                else:
-                    # Store general result
-                    result_content = f"Task result: {str(result)[:200]}..."
-                    memory_manager.store_memory(
+            self._memory_queue.put_nowait((task_request, task_response, result))
+        except asyncio.QueueFull:
+            logger.warning(f"Memory write queue full for {self.agent_name}, dropping task memory")
+    
+    async def _memory_writer(self):
+        """Hand queued task memories to the batched memory writer without waiting for each write.
+        
+        A queue item is marked done once its task memory is written or its
+        last retry failed, so flush() still waits for every write.
+        """
+        while True:
+            item = await self._memory_queue.get()
+            await self._submit_task_memory(item, 0)
+    
+    async def _submit_task_memory(self, item: tuple, attempt: int):
+        """Queue the memories of a task and watch the write of its task memory."""
+        try:
+            memory_future = await asyncio.to_thread(self._store_task_memory, *item)
+        except Exception as e:
+            memory_future = Future()
+            memory_future.set_exception(e)
+        
+        loop = asyncio.get_running_loop()
+        
+        def on_written(future: Future):
+            try:
+                loop.call_soon_threadsafe(self._task_memory_written, item, attempt, future)
+            except RuntimeError:
+                # The loop closed during shutdown; nothing is left to retry on
+                pass
+        
+        memory_future.add_done_callback(on_written)
+    
+    def _task_memory_written(self, item: tuple, attempt: int, future: Future):
+        """Log a finished task memory write, or retry a failed one with backoff."""
+        task_request = item[0]
+        error = future.exception()
+        if error is None and future.result() is None:
+            error = RuntimeError(f"task memory for {task_request.task_type} was not stored")
+        
+        if error is None:
+            logger.info(f"Stored memory for {self.agent_name} task: {task_request.task_type}")
+        elif attempt < MEMORY_WRITE_RETRIES - 1:
+            retry = asyncio.create_task(self._retry_task_memory(item, attempt + 1))
+            self._memory_retries.add(retry)
+            retry.add_done_callback(self._memory_retries.discard)
+            return
+        else:
+            logger.error(f"Failed to store task memory for {self.agent_name}: {error}")
+        
+        self._memory_queue.task_done()
+    
+    async def _retry_task_memory(self, item: tuple, attempt: int):
+        """Queue a task's memories again after an exponential backoff."""
+        await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        await self._submit_task_memory(item, attempt)
+    
+    async def flush(self):
+        """Wait for queued task memory writes and stop the writer."""
+        if self._memory_queue is not None:
+            await self._memory_queue.join()
+        if self._memory_writer_task is not None:
+            self._memory_writer_task.cancel()
+            try:
+                await self._memory_writer_task
+            except asyncio.CancelledError:
+                pass
+            self._memory_writer_task = None
+        
+        await asyncio.to_thread(memory_manager.flush)
+        await super().flush()
+    
+    def _store_task_memory(self, task_request: TaskRequest, task_response: TaskResponse, result: Any) -> Future:
+        """Queue memories about a completed task; returns the future of the task memory's id."""
+        # Store episodic memory about the task
+        task_content = f"Task: {task_request.task_type} - {task_request.description}"
+        if task_request.parameters:
+            task_content += f" | Parameters: {json_dumps(task_request.parameters, default=str)}"
+        
+        task_context = f"Agent: {self.agent_name}, Execution time: {task_response.execution_time}s, Success: {task_response.success}"
+        
+        # Queue the memories for the batched writer; only the task memory is tracked
+        memory_future = memory_manager.queue_memory(
+            agent_name=self.agent_name,
+            memory_type=MemoryType.EPISODIC,
+            memory_category=MemoryCategory.TASK,
+            content=task_content,
+            context=task_context,
+            tags=[task_request.task_type, "task_execution"],
+            importance=0.7 if task_response.success else 0.9,  # Failed tasks are more important to remember
+            confidence=1.0
+        )
+        
+        # Store semantic memory about the result if it's significant
+        if task_response.success and result:
+            if isinstance(result, dict):
+                # Extract key insights from the result
+                for key, category, tags, format_content in _MEMORY_EXTRACTORS:
+                    if key not in result:
+                        continue
+                    content = format_content(result)
+                    if content is None:
+                        continue
+                    memory_manager.queue_memory(
                         agent_name=self.agent_name,
                         memory_type=MemoryType.SEMANTIC,
-                        memory_category=MemoryCategory.KNOWLEDGE,
-                        content=result_content,
+                        memory_category=category,
+                        content=content,
                         context=f"From {task_request.task_type} task",
-                        tags=[task_request.task_type, "result", "knowledge"],
-                        importance=0.6,
+                        tags=[task_request.task_type, *tags],
+                        importance=0.8,
                         confidence=1.0
                     )
-            
-            logger.info(f"Stored memory for {self.agent_name} task: {task_request.task_type}")
-            
-        except Exception as e:
-            logger.error(f"Failed to store task memory for {self.agent_name}: {e}") 
\ No newline at end of file
+            else:
+                # Store general result
+                result_content = f"Task result: {_truncated_text(result, 200)}..."
+                memory_manager.queue_memory(
+                    agent_name=self.agent_name,
+                    memory_type=MemoryType.SEMANTIC,
+                    memory_category=MemoryCategory.KNOWLEDGE,
+                    content=result_content,
+                    context=f"From {task_request.task_type} task",
+                    tags=[task_request.task_type, "result", "knowledge"],
+                    importance=0.6,
+                    confidence=1.0
+                )
+        
+        return memory_future 
\ No newline at end of file
@@ -3,17 +3,26 @@ Agent manager for handling multiple agents.
 """
 
 import asyncio
+import copy
 import logging
+import time
+from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, flush_pending_writes
+from database.manager import get_db_manager
 from .generic_agent import GenericAgent
 from shared.models import AgentStatus, TaskRequest, TaskResponse
-from shared.config import get_enabled_agents
+from shared.config import get_config, get_enabled_agents
 
 logger = logging.getLogger(__name__)
 
+# Per-agent submission batching
+INBOX_MAX_BATCH = 8  # tasks handed to an agent at once
+INBOX_MAX_WAIT = 0.01  # seconds to wait for more tasks after the first
+
 
 class AgentManager:
     """Manager for handling multiple agents."""
@@ -22,67 +31,177 @@ class AgentManager:
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_tasks: Dict[str, asyncio.Task] = {}
         self._initialized = False
+        # Serializes initialize() so concurrent first callers build agents once
+        self._init_lock = asyncio.Lock()
+        self._init_done = asyncio.Event()
+        
+        # Short-lived caches for frequently polled state and health endpoints
+        api_config = get_config().api
+        self._states_ttl = api_config.states_cache_ttl
+        self._health_ttl = api_config.health_cache_ttl
+        self._states_cache: Optional[tuple] = None
+        self._health_cache: Dict[str, tuple] = {}
+        
+        # Per-agent inboxes that group concurrent submissions into batches
+        self._inbox: Dict[str, asyncio.Queue] = {}
+        self._batcher_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Round-robin position per task type for submit_task_to_any_agent
+        self._rr_cursor: Dict[str, int] = defaultdict(int)
     
     async def initialize(self):
         """Initialize all enabled agents."""
         if self._initialized:
             return
         
-        try:
-            enabled_agents = get_enabled_agents()
-            
-            for agent_config in enabled_agents:
-                await self._create_agent(agent_config.name)
+        async with self._init_lock:
+            if self._initialized:
+                return
             
-            self._initialized = True
-            logger.info(f"Agent manager initialized with {len(self.agents)} agents")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize agent manager: {e}")
-            raise
+            try:
+                enabled_agents = get_enabled_agents()
+                
+                # Create the shared database manager here and warm its pool once,
+                # so the agent threads below never race to build the singleton
+                await asyncio.to_thread(get_db_manager().warm_pool)
+                
+                # Build agents concurrently; each constructor does blocking database setup
+                results = await asyncio.gather(
+                    *(self._build_agent(agent_config.name) for agent_config in enabled_agents),
+                    return_exceptions=True
+                )
+                
+                # Register in configuration order so agent selection stays deterministic
+                for agent_config, result in zip(enabled_agents, results):
+                    if isinstance(result, Exception):
+                        logger.error("Failed to create agent '%s': %s", agent_config.name, result)
+                    else:
+                        self.agents[agent_config.name] = result
+                
+                self._initialized = True
+                self._init_done.set()
+                logger.info("Agent manager initialized with %d agents", len(self.agents))
+                
+            except Exception as e:
+                logger.error("Failed to initialize agent manager: %s", e)
+                raise
     
     async def _create_agent(self, agent_name: str) -> BaseAgent:
-        """Create and initialize an agent."""
+        """Create, initialize and register an agent."""
         try:
-            # All agents use the GenericAgent class with different configurations
-            # The configuration determines the personality and capabilities
-            agent = GenericAgent(agent_name)
-            
+            agent = await self._build_agent(agent_name)
             self.agents[agent_name] = agent
-            logger.info(f"Agent '{agent_name}' created successfully with personality: {agent.config.personality}")
-            
             return agent
             
         except Exception as e:
-            logger.error(f"Failed to create agent '{agent_name}': {e}")
+            logger.error("Failed to create agent '%s': %s", agent_name, e)
             raise
     
+    async def _build_agent(self, agent_name: str) -> BaseAgent:
+        """Create and initialize an agent in a worker thread."""
+        # All agents use the GenericAgent class with different configurations
+        # The configuration determines the personality and capabilities
+        agent = await asyncio.to_thread(GenericAgent, agent_name)
+        logger.info("Agent '%s' created successfully with personality: %s", agent_name, agent.config.personality)
+        return agent
+    
+    async def _ensure_initialized(self):
+        """Initialize the agents on first use, or wait for an initialization in progress."""
+        if self._init_done.is_set():
+            return
+        await self.initialize()
+    
+    def get_agent_sync(self, agent_name: str) -> Optional[BaseAgent]:
+        """Get an agent by name without initializing; None until the manager is initialized."""
+        if not self._initialized:
+            return None
+        return self.agents.get(agent_name)
+    
     async def get_agent(self, agent_name: str) -> Optional[BaseAgent]:
         """Get an agent by name."""
-        if not self._initialized:
-            await self.initialize()
-        
+        await self._ensure_initialized()
         return self.agents.get(agent_name)
     
     async def get_all_agents(self) -> List[BaseAgent]:
         """Get all agents."""
-        if not self._initialized:
-            await self.initialize()
-        
+        await self._ensure_initialized()
         return list(self.agents.values())
     
     async def get_agent_states(self) -> List[Dict[str, Any]]:
-        """Get the state of all agents."""
+        """Get the state of all agents, reusing a snapshot for states_cache_ttl seconds."""
+        if self._states_cache is not None:
+            cached_at, states = self._states_cache
+            if time.monotonic() - cached_at < self._states_ttl:
+                return copy.deepcopy(states)
+        
         agents = await self.get_all_agents()
-        return [agent.get_state() for agent in agents]
+        states = [agent.get_state() for agent in agents]
+        self._states_cache = (time.monotonic(), states)
+        return copy.deepcopy(states)
     
     async def submit_task(self, task_request: TaskRequest) -> TaskResponse:
         """Submit a task to a specific agent."""
-        agent = await self.get_agent(task_request.agent_name)
+        agent = self.get_agent_sync(task_request.agent_name)
+        if agent is None and not self._initialized:
+            await self._ensure_initialized()
+            agent = self.get_agent_sync(task_request.agent_name)
         if not agent:
             raise ValueError(f"Agent not found: {task_request.agent_name}")
         
-        return await agent.process_task(task_request)
+        return await self._enqueue_task(agent, task_request)
+    
+    async def _enqueue_task(self, agent: BaseAgent, task_request: TaskRequest) -> TaskResponse:
+        """Put a task in the agent's inbox and wait for its response."""
+        agent_name = agent.agent_name
+        if agent_name not in self._inbox:
+            self._inbox[agent_name] = asyncio.Queue()
+        batcher = self._batcher_tasks.get(agent_name)
+        if batcher is None or batcher.done():
+            self._batcher_tasks[agent_name] = asyncio.create_task(self._batch_worker(agent))
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inbox[agent_name].put_nowait((task_request, future))
+        return await future
+    
+    async def _batch_worker(self, agent: BaseAgent):
+        """Hand queued tasks to the agent in batches of up to INBOX_MAX_BATCH."""
+        queue = self._inbox[agent.agent_name]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + INBOX_MAX_WAIT
+            while len(batch) < INBOX_MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await agent.process_task_batch([task_request for task_request, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                queue.task_done()
+    
+    async def _stop_batchers(self):
+        """Wait for queued submissions to finish and stop the inbox workers."""
+        for agent_name, queue in self._inbox.items():
+            if agent_name in self._batcher_tasks:
+                await queue.join()
+        for batcher in self._batcher_tasks.values():
+            batcher.cancel()
+        await asyncio.gather(*self._batcher_tasks.values(), return_exceptions=True)
+        self._batcher_tasks.clear()
+        self._inbox.clear()
     
     async def submit_task_to_any_agent(self, task_type: str, description: str, **kwargs) -> Optional[TaskResponse]:
         """Submit a task to any available agent that can handle it."""
@@ -97,9 +216,16 @@ class AgentManager:
         if not available_agents:
             raise RuntimeError("No available agents to handle the task")
         
-        # For now, just pick the first available agent
-        # In the future, this could be more sophisticated (load balancing, etc.)
-        agent = available_agents[0]
+        # Prefer agents with dedicated handling for this task type
+        capable_agents = [
+            agent for agent in available_agents
+            if agent.can_handle(task_type)
+        ] or available_agents
+        
+        # Rotate through the candidates so load spreads across agents
+        cursor = self._rr_cursor[task_type]
+        self._rr_cursor[task_type] = cursor + 1
+        agent = capable_agents[cursor % len(capable_agents)]
         
         task_request = TaskRequest(
             agent_name=agent.agent_name,
@@ -108,22 +234,39 @@ class AgentManager:
             parameters=kwargs
         )
         
-        return await agent.process_task(task_request)
+        return await self._enqueue_task(agent, task_request)
     
     async def health_check(self) -> Dict[str, Any]:
-        """Perform health check on all agents."""
+        """Perform health check on all agents.
+        
+        Each agent's result is reused for health_cache_ttl seconds, so only
+        agents whose entry has gone stale are probed again.
+        """
         agents = await self.get_all_agents()
         health_results = {}
+        now = time.monotonic()
         
+        stale_agents = []
         for agent in agents:
-            try:
-                health_result = await agent.health_check()
-                health_results[agent.agent_name] = health_result
-            except Exception as e:
-                health_results[agent.agent_name] = {
+            cached = self._health_cache.get(agent.agent_name)
+            if cached is not None and now - cached[0] < self._health_ttl:
+                health_results[agent.agent_name] = dict(cached[1])
+            else:
+                stale_agents.append(agent)
+        
+        # Probe stale agents concurrently; each check may wait on an LLM call
+        results = await asyncio.gather(
+            *(agent.health_check() for agent in stale_agents),
+            return_exceptions=True
+        )
+        for agent, health_result in zip(stale_agents, results):
+            if isinstance(health_result, Exception):
+                health_result = {
                     "status": "error",
-                    "error": str(e)
+                    "error": str(health_result)
                 }
+            health_results[agent.agent_name] = health_result
+            self._health_cache[agent.agent_name] = (time.monotonic(), dict(health_result))
         
         return {
             "timestamp": datetime.utcnow().isoformat(),
@@ -139,33 +282,55 @@ class AgentManager:
                 old_agent = self.agents[agent_name]
                 # Clean up any resources if needed
                 del self.agents[agent_name]
+            self._states_cache = None
+            self._health_cache.pop(agent_name, None)
             
             # Create a new agent
             await self._create_agent(agent_name)
             
-            logger.info(f"Agent '{agent_name}' restarted successfully")
+            logger.info("Agent '%s' restarted successfully", agent_name)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to restart agent '{agent_name}': {e}")
+            logger.error("Failed to restart agent '%s': %s", agent_name, e)
             return False
     
     async def shutdown(self):
         """Shutdown all agents."""
         try:
-            for agent_name, agent in self.agents.items():
-                try:
-                    agent.update_status(AgentStatus.OFFLINE)
-                    logger.info(f"Agent '{agent_name}' shutdown")
-                except Exception as e:
-                    logger.error(f"Error shutting down agent '{agent_name}': {e}")
+            await self._stop_batchers()
+            await asyncio.gather(
+                *(self._shutdown_agent(agent_name, agent) for agent_name, agent in self.agents.items())
+            )
+            
+            # Mark every agent offline in a single UPDATE
+            await asyncio.to_thread(
+                get_db_manager().bulk_update_agent_status, list(self.agents), AgentStatus.OFFLINE
+            )
+            
+            # Write out any buffered messages and tasks
+            await flush_pending_writes()
             
             self.agents.clear()
             self._initialized = False
+            self._init_done.clear()
+            self._states_cache = None
+            self._health_cache.clear()
             logger.info("Agent manager shutdown complete")
             
         except Exception as e:
-            logger.error(f"Error during agent manager shutdown: {e}")
+            logger.error("Error during agent manager shutdown: %s", e)
+    
+    async def _shutdown_agent(self, agent_name: str, agent: BaseAgent):
+        """Finish an agent's pending work and mark it offline in memory."""
+        try:
+            await agent.drain_tasks()
+            await agent.flush()
+            await agent.flush_state()
+            agent.mark_offline()
+            logger.info("Agent '%s' shutdown", agent_name)
+        except Exception as e:
+            logger.error("Error shutting down agent '%s': %s", agent_name, e)
     
     def get_agent_info(self) -> Dict[str, Any]:
         """Get information about all agents."""
@@ -179,13 +344,15 @@ class AgentManager:
         }
 
 
-# Global agent manager instance
-agent_manager = AgentManager()
+@lru_cache(maxsize=1)
+def _get_agent_manager() -> AgentManager:
+    """Create the global agent manager on first use."""
+    return AgentManager()
 
 
 async def get_agent_manager() -> AgentManager:
     """Get the global agent manager."""
-    return agent_manager
+    return _get_agent_manager()
 
 
 async def initialize_agents():
@@ -0,0 +1,25 @@
+"""
+Shared pytest fixtures for the unit tests.
+"""
+
+import pytest
+
+import agents.base_agent as base_agent
+import database.memory_manager as memory_module
+from database.manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A DatabaseManager on a fresh SQLite file with every table created.
+    
+    The memory manager and the agents' row writer open their sessions on it
+    instead of the global database. Test modules extend this fixture with
+    their own seed rows.
+    """
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    manager.create_tables()
+    monkeypatch.setattr(memory_module, "get_db_session", manager.get_session)
+    monkeypatch.setattr(base_agent, "get_db_session", manager.get_session)
+    yield manager
+    manager.engine.dispose()
@@ -2,19 +2,105 @@
 Database manager for the multi-agent system.
 """
 
+import io
 import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from sqlalchemy import create_engine, text
+from typing import Optional, Iterator, List, Dict, Any, Tuple
+from sqlalchemy import (
+    JSON, DateTime, LargeBinary, Row, Table, bindparam, create_engine, event, inspect, select, text, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
-from .models import Base
+from .models import Base, Agent, AgentState, CodeReview, Memory
 from shared.config import get_config
+from shared.models import AgentStatus
+from shared.serialization import dumps as json_dumps, loads as json_loads
 
 logger = logging.getLogger(__name__)
 
+# Connection settings applied to every SQLite connection: WAL lets readers
+# proceed while a writer is active, and mmap serves hot pages without read() calls
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# SQLite online backup: pages copied per step and seconds to yield between steps
+BACKUP_PAGES_PER_STEP = 1000
+BACKUP_STEP_SLEEP = 0.05
+
+# Rows removed per DELETE statement when cleaning up old data
+CLEANUP_BATCH_SIZE = 10000
+
+# Tables whose row counts health_check reports
+_HEALTH_TABLES = ("agents", "agent_states", "conversations", "messages", "tasks", "memories", "code_reviews")
+
+# Statements used on every health check or cleanup, parsed once at import
+_SQL_HEALTH_PING = text("SELECT 1 as test")
+_SQL_TABLE_COUNTS = text(
+    "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in _HEALTH_TABLES)
+)
+_SQL_TABLE_COUNT = {
+    table: text(f"SELECT COUNT(*) as count FROM {table}") for table in _HEALTH_TABLES
+}
+# (table, chunked DELETE of rows older than :cutoff) pruned by cleanup_old_data
+_SQL_CLEANUP = tuple(
+    (table, text(
+        f"DELETE FROM {table} WHERE id IN "
+        f"(SELECT id FROM {table} WHERE {column} < :cutoff LIMIT :batch_size)"
+    ))
+    for table, column in (("messages", "timestamp"), ("tasks", "created_at"), ("memories", "created_at"))
+)
+
+# Raw queries passed to execute_query are usually a small fixed set, so
+# keep their parsed text() clauses instead of re-parsing every call
+_cached_text = lru_cache(maxsize=256)(text)
+
+# Read results kept by execute_query for database.query_cache_ttl seconds
+QUERY_CACHE_SIZE = 256
+# Keywords that make a statement count as a write; false positives only cost
+# a skipped cache entry or an extra invalidation
+_WRITE_KEYWORDS = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|MERGE|REPLACE|UPSERT|INTO|CREATE|DROP|ALTER|TRUNCATE|"
+    r"GRANT|REVOKE|COPY|ATTACH|DETACH|VACUUM|REINDEX|NEXTVAL|SETVAL)\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_read_statement(statement: str) -> bool:
+    """Whether a statement is a plain SELECT that names no write keyword.
+    
+    WITH queries count as writes, since a CTE may insert, update or delete.
+    """
+    words = statement.split(None, 1)
+    return bool(words) and words[0].upper() == "SELECT" and not _WRITE_KEYWORDS.search(statement)
+
+
+# Memories hashed per statement when backfilling content_hash of older rows
+CONTENT_HASH_BATCH = 1000
+
+# Batches of at least this many rows are loaded with COPY on PostgreSQL
+COPY_MIN_ROWS = 100
+_COPY_DRIVERS = ("psycopg2", "psycopg")
+
 
 class DatabaseManager:
     """Database manager for handling database operations."""
@@ -24,6 +110,15 @@ class DatabaseManager:
         self.database_url = database_url or f"sqlite:///{self.config.database.path}"
         self.engine = None
         self.SessionLocal = None
+        self._pool_warmed = False
+        # Table name -> (monotonic time counted, row count) for health_check
+        self._count_cache: Dict[str, Tuple[float, int]] = {}
+        # (query, params) -> (monotonic time fetched, rows) for execute_query;
+        # cleared whenever a transaction that wrote anything commits
+        self._query_cache: "OrderedDict[tuple, Tuple[float, List[Row]]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # Bumped by every clear, so a read that overlapped a write does not store its rows
+        self._query_cache_generation = 0
         self._setup_database()
     
     def _setup_database(self):
@@ -33,38 +128,280 @@ class DatabaseManager:
             db_path = Path(self.config.database.path)
             db_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Create engine
-            self.engine = create_engine(
-                self.database_url,
-                echo=self.config.app.debug,
-                connect_args={"check_same_thread": False} if "sqlite" in self.database_url else {}
-            )
+            # Create engine with a shared connection pool so agents reuse
+            # connections instead of reconnecting on every session
+            engine_kwargs: Dict[str, Any] = {
+                "echo": self.config.app.debug,
+                "pool_pre_ping": True,
+                # Faster encoding for the JSON metadata, parameters and result columns
+                "json_serializer": json_dumps,
+                "json_deserializer": json_loads,
+                # Room for every ORM and raw statement the agents compile
+                "query_cache_size": 1200,
+            }
+            
+            if "sqlite" in self.database_url:
+                engine_kwargs["connect_args"] = {"check_same_thread": False}
+            
+            if self.database_url in ("sqlite://", "sqlite:///:memory:"):
+                # In-memory databases only exist on a single connection
+                engine_kwargs["poolclass"] = StaticPool
+            else:
+                engine_kwargs.update(
+                    pool_size=self.config.database.pool_size,
+                    max_overflow=self.config.database.max_overflow,
+                    pool_timeout=self.config.database.pool_timeout,
+                    pool_recycle=self.config.database.pool_recycle,
+                )
+            
+            self.engine = create_engine(self.database_url, **engine_kwargs)
+            
+            if "sqlite" in self.database_url:
+                event.listen(self.engine, "connect", self._apply_sqlite_pragmas)
+            
+            event.listen(self.engine, "before_cursor_execute", self._track_write)
+            event.listen(self.engine, "commit", self._invalidate_on_write_commit)
+            event.listen(self.engine, "rollback", self._forget_writes)
+            event.listen(self.engine.pool, "checkin", self._invalidate_after_write_commit)
             
-            # Create session factory
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            # Create session factory; objects keep their loaded values after
+            # commit instead of being re-selected on the next attribute read
+            self.SessionLocal = sessionmaker(
+                autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine
+            )
             
-            logger.info(f"Database setup complete: {self.database_url}")
+            logger.info("Database setup complete: %s", self.database_url)
             
         except Exception as e:
-            logger.error(f"Failed to setup database: {e}")
+            logger.error("Failed to setup database: %s", e)
             raise
     
+    @staticmethod
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        """Configure a new SQLite connection for concurrent access."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _track_write(connection, cursor, statement, parameters, context, executemany):
+        """Flag connections that run anything other than a read."""
+        if not _is_read_statement(statement) and not statement.lstrip()[:6].upper().startswith("PRAGMA"):
+            connection.info["wrote"] = True
+    
+    def _invalidate_on_write_commit(self, connection):
+        """Drop cached query results when written data is about to be committed."""
+        if connection.info.pop("wrote", False):
+            connection.info["committed_write"] = True
+            self.clear_query_cache()
+    
+    def _invalidate_after_write_commit(self, dbapi_connection, connection_record):
+        """Clear again once the commit is done, dropping reads that ran just before it."""
+        if connection_record is not None and connection_record.info.pop("committed_write", False):
+            self.clear_query_cache()
+    
+    @staticmethod
+    def _forget_writes(connection):
+        """Reset the write flag of a rolled back transaction."""
+        connection.info.pop("wrote", None)
+    
+    def clear_query_cache(self):
+        """Discard all cached execute_query results."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+            self._query_cache_generation += 1
+    
+    @staticmethod
+    def _query_cache_key(query: str, params: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """Return the cache key for a read query, or None if it cannot be cached."""
+        if not _is_read_statement(query):
+            return None
+        key = (query, tuple(sorted((params or {}).items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def warm_pool(self):
+        """Open pool_size connections once so early requests do not pay connect cost."""
+        if self._pool_warmed or not isinstance(self.engine.pool, QueuePool):
+            return
+        
+        self._pool_warmed = True
+        try:
+            connections = [self.engine.connect() for _ in range(self.engine.pool.size())]
+            for connection in connections:
+                connection.close()
+            logger.debug("Warmed database pool with %d connections", len(connections))
+        except Exception as e:
+            logger.error("Failed to warm database pool: %s", e)
+    
     def create_tables(self):
         """Create all database tables."""
         try:
             Base.metadata.create_all(bind=self.engine)
+            self._add_missing_columns()
+            self._convert_code_hashes()
+            self._convert_postgresql_json_columns()
+            self._backfill_memory_content_hashes()
+            
+            # create_all skips existing tables, so add any indexes that were
+            # introduced after those tables were first created
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=self.engine, checkfirst=True)
+            
             logger.info("Database tables created successfully")
         except Exception as e:
-            logger.error(f"Failed to create database tables: {e}")
+            logger.error("Failed to create database tables: %s", e)
             raise
     
+    def _add_missing_columns(self):
+        """Add nullable model columns that existing tables were created without."""
+        inspector = inspect(self.engine)
+        existing_tables = set(inspector.get_table_names())
+        
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    continue
+                
+                existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing_columns:
+                        continue
+                    if not column.nullable:
+                        logger.warning("Cannot add NOT NULL column %s.%s to existing table", table.name, column.name)
+                        continue
+                    
+                    column_ddl = CreateColumn(column).compile(dialect=self.engine.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}")
+                    logger.info("Added column %s.%s", table.name, column.name)
+    
+    def _convert_code_hashes(self):
+        """Convert hex code_hash values stored before the column became binary."""
+        columns = {column["name"]: column for column in inspect(self.engine).get_columns("code_reviews")}
+        if isinstance(columns["code_hash"]["type"], LargeBinary):
+            return
+        
+        with self.engine.begin() as connection:
+            if self.engine.dialect.name == "postgresql":
+                connection.exec_driver_sql(
+                    "ALTER TABLE code_reviews ALTER COLUMN code_hash TYPE BYTEA "
+                    "USING decode(code_hash, 'hex')"
+                )
+                logger.info("Converted code_reviews.code_hash to BYTEA")
+            elif self.engine.dialect.name == "sqlite":
+                # SQLite keeps the declared type, so only the stored values change
+                rows = connection.exec_driver_sql(
+                    "SELECT id, code_hash FROM code_reviews WHERE typeof(code_hash) = 'text'"
+                ).all()
+                if rows:
+                    connection.execute(
+                        update(CodeReview.__table__).where(CodeReview.__table__.c.id == bindparam("review_id")),
+                        [{"review_id": row.id, "code_hash": bytes.fromhex(row.code_hash)} for row in rows]
+                    )
+                    logger.info("Converted %d hex code hashes to binary", len(rows))
+            else:
+                logger.warning("Cannot convert code_reviews.code_hash to binary on %s", self.engine.dialect.name)
+    
+    def _convert_postgresql_json_columns(self):
+        """Convert json columns of older PostgreSQL tables to the JSONB and array types of the models.
+        
+        The GIN indexes on these columns and the ?& tag filter only work with
+        the new types, so this runs before missing indexes are created.
+        """
+        if self.engine.dialect.name != "postgresql":
+            return
+        
+        dialect = self.engine.dialect
+        preparer = dialect.identifier_preparer
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                current_types = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    model_type = column.type.dialect_impl(dialect)
+                    current_type = current_types.get(column.name)
+                    name = preparer.quote(column.name)
+                    
+                    if isinstance(model_type, postgresql.JSONB) and not isinstance(current_type, postgresql.JSONB):
+                        using = f"{name}::jsonb"
+                    elif isinstance(model_type, postgresql.ARRAY) and not isinstance(current_type, postgresql.ARRAY):
+                        # JSON arrays like [1, 2] become {1, 2}; other JSON values become NULL
+                        using = (
+                            f"CASE WHEN json_typeof({name}::json) = 'array' "
+                            f"THEN translate({name}::text, '[]', '{{}}')::{model_type.compile(dialect=dialect)} END"
+                        )
+                    else:
+                        continue
+                    
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {preparer.format_table(table)} ALTER COLUMN {name} "
+                        f"TYPE {model_type.compile(dialect=dialect)} USING {using}"
+                    )
+                    logger.info("Converted %s.%s to %s", table.name, column.name, model_type.compile(dialect=dialect))
+    
+    def _backfill_memory_content_hashes(self):
+        """Hash the content of memories stored before content_hash existed.
+        
+        Without a hash the unique (agent_id, content_hash) index cannot match
+        these rows, so storing their content again would add a duplicate. When
+        an agent already has several rows with the same content, only the
+        first one gets the hash; the others keep NULL and are left in place.
+        """
+        # Imported here because memory_manager imports this module
+        from .memory_manager import _content_hash
+        
+        memories = Memory.__table__
+        backfilled = 0
+        last_id = 0
+        with self.engine.begin() as connection:
+            while True:
+                rows = connection.execute(
+                    select(memories.c.id, memories.c.agent_id, memories.c.content)
+                    .where(memories.c.content_hash.is_(None), memories.c.id > last_id)
+                    .order_by(memories.c.id)
+                    .limit(CONTENT_HASH_BATCH)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                
+                hashes = {row.id: (row.agent_id, _content_hash(row.content)) for row in rows}
+                taken = set(connection.execute(
+                    select(memories.c.agent_id, memories.c.content_hash).where(
+                        memories.c.agent_id.in_({agent_id for agent_id, _ in hashes.values()}),
+                        memories.c.content_hash.in_({content_hash for _, content_hash in hashes.values()})
+                    )
+                ).all())
+                
+                updates = []
+                for memory_id, key in hashes.items():
+                    if key not in taken:
+                        taken.add(key)
+                        updates.append({"memory_id": memory_id, "content_hash": key[1]})
+                if updates:
+                    connection.execute(
+                        update(memories).where(memories.c.id == bindparam("memory_id")),
+                        updates
+                    )
+                    backfilled += len(updates)
+        
+        if backfilled:
+            logger.info("Backfilled content_hash of %d memories", backfilled)
+    
     def drop_tables(self):
         """Drop all database tables."""
         try:
             Base.metadata.drop_all(bind=self.engine)
             logger.info("Database tables dropped successfully")
         except Exception as e:
-            logger.error(f"Failed to drop database tables: {e}")
+            logger.error("Failed to drop database tables: %s", e)
             raise
     
     def get_session(self) -> Session:
@@ -73,35 +410,136 @@ class DatabaseManager:
             raise RuntimeError("Database not initialized")
         return self.SessionLocal()
     
-    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Execute a raw SQL query."""
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a session that commits on success, rolls back on error and is always closed."""
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        session: Optional[Session] = None
+    ) -> List[Row]:
+        """Execute a raw SQL query and return its rows as named tuples.
+        
+        Pass session to run the query in an existing session instead of
+        checking out a new one. Without a session, results of SELECT queries
+        are reused for database.query_cache_ttl seconds or until a write is
+        committed.
+        """
         try:
-            with self.get_session() as session:
-                result = session.execute(text(query), params or {})
-                return [dict(row._mapping) for row in result]
+            if session is not None:
+                return session.execute(_cached_text(query), params or {}).all()
+            
+            ttl = self.config.database.query_cache_ttl
+            key = self._query_cache_key(query, params) if ttl > 0 else None
+            if key is not None:
+                with self._query_cache_lock:
+                    cached = self._query_cache.get(key)
+                    if cached and time.monotonic() - cached[0] < ttl:
+                        self._query_cache.move_to_end(key)
+                        return list(cached[1])
+                    generation = self._query_cache_generation
+            
+            with self.session_scope() as session:
+                rows = session.execute(_cached_text(query), params or {}).all()
+            
+            if key is not None:
+                with self._query_cache_lock:
+                    # A write committed while the query ran, so the rows may be stale
+                    if generation != self._query_cache_generation:
+                        return rows
+                    self._query_cache[key] = (time.monotonic(), rows)
+                    self._query_cache.move_to_end(key)
+                    if len(self._query_cache) > QUERY_CACHE_SIZE:
+                        self._query_cache.popitem(last=False)
+                return list(rows)
+            return rows
         except SQLAlchemyError as e:
-            logger.error(f"Database query failed: {e}")
+            logger.error("Database query failed: %s", e)
             raise
     
-    def health_check(self) -> Dict[str, Any]:
-        """Perform database health check."""
+    def execute_query_dict(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        session: Optional[Session] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute a raw SQL query and return its rows as dictionaries."""
+        return [dict(row._mapping) for row in self.execute_query(query, params, session)]
+    
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """Execute a raw SQL query and yield its rows without loading them all at once."""
         try:
-            with self.get_session() as session:
+            with self.session_scope() as session:
+                result = session.execute(
+                    _cached_text(query).execution_options(stream_results=True, yield_per=batch_size),
+                    params or {}
+                )
+                yield from result
+        except SQLAlchemyError as e:
+            logger.error("Database query failed: %s", e)
+            raise
+    
+    def ping(self) -> bool:
+        """Check that the database answers a trivial query on a pooled connection."""
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+        return True
+    
+    def health_check(self, deep: bool = False) -> Dict[str, Any]:
+        """Perform database health check.
+        
+        A shallow check only pings the database. A deep check also reports
+        table counts, which are reused for database.count_cache_ttl seconds.
+        """
+        if not deep:
+            try:
+                self.ping()
+                return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+            except Exception as e:
+                logger.error("Database ping failed: %s", e)
+                return {
+                    "status": "unhealthy",
+                    "error": str(e),
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+        
+        try:
+            with self.session_scope() as session:
                 # Test basic query
-                result = session.execute(text("SELECT 1 as test"))
+                result = session.execute(_SQL_HEALTH_PING)
                 result.fetchone()
                 
-                # Get table counts
-                tables = ["agents", "agent_states", "conversations", "messages", "tasks", "memories", "code_reviews"]
-                table_counts = {}
+                # Get table counts, refreshing them all in one round trip
+                # once any cached count has expired
+                now = time.monotonic()
+                ttl = self.config.database.count_cache_ttl
                 
-                for table in tables:
-                    try:
-                        result = session.execute(text(f"SELECT COUNT(*) as count FROM {table}"))
-                        count = result.fetchone()[0]
-                        table_counts[table] = count
-                    except Exception:
-                        table_counts[table] = 0
+                if all(
+                    table in self._count_cache and now - self._count_cache[table][0] < ttl
+                    for table in _HEALTH_TABLES
+                ):
+                    table_counts = {table: self._count_cache[table][1] for table in _HEALTH_TABLES}
+                else:
+                    table_counts = self._count_tables(session)
+                    self._count_cache.update(
+                        (table, (now, count)) for table, count in table_counts.items()
+                    )
                 
                 return {
                     "status": "healthy",
@@ -110,24 +548,76 @@ class DatabaseManager:
                 }
                 
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error("Database health check failed: %s", e)
             return {
                 "status": "unhealthy",
                 "error": str(e),
                 "database_url": self.database_url
             }
     
+    @staticmethod
+    def _count_tables(session: Session) -> Dict[str, int]:
+        """Count the rows of every health check table with a single SELECT."""
+        try:
+            return dict(session.execute(_SQL_TABLE_COUNTS).one()._mapping)
+        except SQLAlchemyError:
+            # A missing table fails the combined query; count only the tables
+            # that exist, found with one catalog lookup
+            session.rollback()
+        
+        existing = set(inspect(session.connection()).get_table_names())
+        return {
+            table: DatabaseManager._count(session, table) if table in existing else 0
+            for table in _HEALTH_TABLES
+        }
+    
+    @staticmethod
+    def _count(session: Session, table: str) -> int:
+        """Count the rows of one table, or return 0 if it cannot be read."""
+        try:
+            return session.execute(_SQL_TABLE_COUNT[table]).scalar()
+        except SQLAlchemyError:
+            session.rollback()
+            return 0
+    
+    def bulk_update_agent_status(self, names: List[str], status: AgentStatus) -> int:
+        """Set the status of several agents in one UPDATE and return the rows changed."""
+        if not names:
+            return 0
+        
+        now = datetime.utcnow()
+        try:
+            with self.session_scope() as session:
+                result = session.execute(
+                    update(AgentState)
+                    .where(AgentState.agent_id.in_(select(Agent.id).where(Agent.name.in_(names))))
+                    .values(status=status.value, current_task=None, last_activity=now, updated_at=now)
+                )
+                return result.rowcount
+        except Exception as e:
+            logger.error("Failed to update status for agents %s: %s", names, e)
+            return 0
+    
     def backup_database(self, backup_path: Optional[str] = None) -> bool:
         """Create a backup of the database."""
         try:
             if not backup_path:
                 backup_path = f"{self.config.database.path}.backup"
             
-            # For SQLite, we can simply copy the file
+            # For SQLite, use the online backup API: it copies a consistent
+            # snapshot (including WAL contents) in page batches and lets
+            # writers proceed between batches
             if "sqlite" in self.database_url:
-                import shutil
-                shutil.copy2(self.config.database.path, backup_path)
-                logger.info(f"Database backup created: {backup_path}")
+                source = sqlite3.connect(self.config.database.path)
+                try:
+                    target = sqlite3.connect(backup_path)
+                    try:
+                        source.backup(target, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+                    finally:
+                        target.close()
+                finally:
+                    source.close()
+                logger.info("Database backup created: %s", backup_path)
                 return True
             else:
                 # For other databases, implement specific backup logic
@@ -135,56 +625,140 @@ class DatabaseManager:
                 return False
                 
         except Exception as e:
-            logger.error(f"Database backup failed: {e}")
+            logger.error("Database backup failed: %s", e)
             return False
     
     def cleanup_old_data(self, days: int = 30) -> int:
-        """Clean up old data from the database."""
+        """Clean up old data from the database.
+        
+        Rows are deleted in chunks of CLEANUP_BATCH_SIZE against indexed
+        timestamp columns, and all tables are pruned in a single transaction.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
         try:
-            with self.get_session() as session:
-                # Clean up old messages
-                result = session.execute(
-                    text("DELETE FROM messages WHERE timestamp < datetime('now', '-{} days')".format(days))
-                )
-                messages_deleted = result.rowcount
+            with self.session_scope() as session:
+                deleted = {}
+                for table, statement in _SQL_CLEANUP:
+                    deleted[table] = 0
+                    while True:
+                        result = session.execute(
+                            statement, {"cutoff": cutoff, "batch_size": CLEANUP_BATCH_SIZE}
+                        )
+                        deleted[table] += result.rowcount
+                        if result.rowcount < CLEANUP_BATCH_SIZE:
+                            break
                 
-                # Clean up old tasks
-                result = session.execute(
-                    text("DELETE FROM tasks WHERE created_at < datetime('now', '-{} days')".format(days))
-                )
-                tasks_deleted = result.rowcount
-                
-                # Clean up old memories
-                result = session.execute(
-                    text("DELETE FROM memories WHERE created_at < datetime('now', '-{} days')".format(days))
-                )
-                memories_deleted = result.rowcount
-                
-                session.commit()
-                
-                total_deleted = messages_deleted + tasks_deleted + memories_deleted
-                logger.info(f"Cleaned up {total_deleted} old records")
-                return total_deleted
+            for table, count in deleted.items():
+                if count:
+                    self._count_cache.pop(table, None)
+            
+            total_deleted = sum(deleted.values())
+            logger.info("Cleaned up %d old records: %s", total_deleted, deleted)
+            return total_deleted
                 
         except Exception as e:
-            logger.error(f"Database cleanup failed: {e}")
+            logger.error("Database cleanup failed: %s", e)
             return 0
 
+def dialect_insert(session: Session):
+    """Return the dialect-specific insert() that supports ON CONFLICT.
+    
+    Returns None for other databases; callers then check for an existing
+    row before inserting.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def bulk_insert(session: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Insert rows into a table in the session's transaction.
+    
+    Batches of COPY_MIN_ROWS or more on PostgreSQL are streamed with COPY,
+    which avoids per-row INSERT overhead; everything else uses executemany.
+    """
+    if not rows:
+        return
+    
+    bind = session.get_bind()
+    if len(rows) < COPY_MIN_ROWS or bind.dialect.name != "postgresql" or bind.dialect.driver not in _COPY_DRIVERS:
+        session.execute(table.insert(), rows)
+        return
+    
+    dialect = bind.dialect
+    columns = [table.c[name] for name in rows[0]]
+    
+    # COPY skips client-side column defaults, so resolve them once per batch
+    defaults: Dict[str, Any] = {}
+    now = datetime.utcnow()
+    for column in table.columns:
+        if column.name in rows[0] or column.default is None:
+            continue
+        if column.default.is_scalar:
+            defaults[column.name] = column.default.arg
+        elif isinstance(column.type, DateTime):
+            defaults[column.name] = now
+    columns.extend(table.c[name] for name in defaults)
+    
+    types = [column.type.dialect_impl(dialect) for column in columns]
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(
+            _copy_field(column_type, row[column.name] if column.name in row else defaults[column.name])
+            for column, column_type in zip(columns, types)
+        ))
+        buffer.write("\n")
+    buffer.seek(0)
+    
+    preparer = dialect.identifier_preparer
+    copy_sql = (
+        f"COPY {preparer.format_table(table)} "
+        f"({', '.join(preparer.quote(column.name) for column in columns)}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    cursor = session.connection().connection.cursor()
+    try:
+        if dialect.driver == "psycopg2":
+            cursor.copy_expert(copy_sql, buffer)
+        else:
+            with cursor.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
 
-# Global database manager instance
-db_manager = DatabaseManager()
 
+def _copy_field(column_type: Any, value: Any) -> str:
+    """Format a value as a quoted CSV field for COPY; NULL is an empty unquoted field."""
+    if value is None:
+        return ""
+    if isinstance(column_type, postgresql.ARRAY):
+        value = "{" + ",".join("NULL" if item is None else str(item) for item in value) + "}"
+    elif isinstance(column_type, JSON):
+        value = json_dumps(value)
+    elif isinstance(value, bytes):
+        value = "\\x" + value.hex()
+    return '"' + str(value).replace('"', '""') + '"'
 
+
+@lru_cache(maxsize=1)
 def get_db_manager() -> DatabaseManager:
-    """Get the global database manager."""
-    return db_manager
+    """Get the global database manager, creating it on first use."""
+    return DatabaseManager()
 
 
 def get_db_session() -> Session:
     """Get a database session."""
-    return db_manager.get_session()
+    return get_db_manager().get_session()
+
+
+def session_scope():
+    """Get a transactional session context from the global database manager."""
+    return get_db_manager().session_scope()
 
 
 def init_database():
     """Initialize the database with tables."""
-    db_manager.create_tables() 
\ No newline at end of file
+    get_db_manager().create_tables() 
\ No newline at end of file
@@ -2,19 +2,65 @@
 Memory management system for hierarchical agent memory.
 """
 
+import atexit
 import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, or_, bindparam, desc, func, literal_column, select, update
 import json
 import hashlib
 
-from .manager import get_db_session
-from .models import Memory, MemoryRelationship, Agent
+from .manager import dialect_insert, get_db_session
+from .models import Memory, MemoryRelationship, Agent, MEMORY_SEARCH_VECTOR
+from shared.semantic_cache import cosine_similarity, term_vector
 
 logger = logging.getLogger(__name__)
 
+AGENT_ID_CACHE_TTL = 300.0  # seconds an agent name -> id lookup is reused
+
+# Settings for hybrid_lexical_search
+HYBRID_CANDIDATES = 500  # text matches scored for term-vector similarity
+RRF_K = 60  # reciprocal rank fusion constant
+
+# Substring search matches up to SEARCH_TERMS query terms with one fixed
+# predicate, so the statement compiles once regardless of the term count
+SEARCH_TERMS = 8
+_SEARCH_TERMS_FILTER = or_(*(
+    column.ilike(bindparam(f"search_term_{i}"))
+    for i in range(SEARCH_TERMS)
+    for column in (Memory.content, Memory.context)
+))
+
+# Write-behind settings for queue_memory
+MEMORY_BATCH_SIZE = 100  # memories inserted per batch
+MEMORY_INSERT_PAGE_SIZE = 1000  # rows per multi-row INSERT statement
+
+ACCESS_FLUSH_INTERVAL = 5.0  # seconds between writes of buffered access counts
+
+# Short-lived cache of retrieve_memories results
+READ_CACHE_SIZE = 512  # cached argument combinations
+READ_CACHE_TTL = 1.0  # seconds a result is reused
+
+# Templates for semantic memories consolidated from episodic ones
+_CONSOLIDATED_WITH_CONTEXT = "Learned: {} (Context: {})".format
+_CONSOLIDATED = "Learned: {}".format
+
+# Columns returned by retrieve_memories
+_RETRIEVE_COLUMNS = load_only(
+    Memory.id, Memory.memory_type, Memory.memory_category, Memory.content, Memory.context,
+    Memory.importance, Memory.confidence, Memory.access_count, Memory.created_at,
+    Memory.accessed_at, Memory.tags, Memory.related_memories
+)
+
 
 class MemoryType:
     """Memory type constants."""
@@ -33,11 +79,235 @@ class MemoryCategory:
     CONTEXT = "context"
 
 
+def _content_hash(content: str) -> str:
+    """Hash memory content for duplicate detection."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=32).hexdigest()
+
+
+def bulk_insert_memories(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert memory rows with multi-row INSERTs in the caller's transaction.
+    
+    Each row is a dict of Memory column values including content_hash; rows
+    whose content the agent already stores are skipped.
+    """
+    if not rows:
+        return
+    
+    insert = dialect_insert(session)
+    if insert is None:
+        # No ON CONFLICT on this database: drop duplicates before inserting
+        rows = list({(row["agent_id"], row["content_hash"]): row for row in reversed(rows)}.values())[::-1]
+        stored = set(session.query(Memory.agent_id, Memory.content_hash).filter(
+            Memory.agent_id.in_({row["agent_id"] for row in rows}),
+            Memory.content_hash.in_({row["content_hash"] for row in rows})
+        ).all())
+        rows = [row for row in rows if (row["agent_id"], row["content_hash"]) not in stored]
+        if rows:
+            session.execute(Memory.__table__.insert(), rows)
+        return
+    
+    session.execute(
+        insert(Memory.__table__)
+        .on_conflict_do_nothing(index_elements=[Memory.agent_id, Memory.content_hash])
+        .execution_options(insertmanyvalues_page_size=MEMORY_INSERT_PAGE_SIZE),
+        rows
+    )
+
+
+@lru_cache(maxsize=4096)
+def _importance(memory_type: str, memory_category: str, content_length: int) -> float:
+    """Calculate memory importance based on type, category, and content length."""
+    base_importance = 0.5
+    
+    # Adjust by memory type
+    if memory_type == MemoryType.WORKING:
+        base_importance *= 0.7  # Working memory is less important
+    elif memory_type == MemoryType.SEMANTIC:
+        base_importance *= 1.2  # Semantic memory is more important
+    
+    # Adjust by category
+    if memory_category == MemoryCategory.SOLUTION:
+        base_importance *= 1.3  # Solutions are important
+    elif memory_category == MemoryCategory.PATTERN:
+        base_importance *= 1.2  # Patterns are important
+    elif memory_category == MemoryCategory.KNOWLEDGE:
+        base_importance *= 1.1  # Knowledge is important
+    
+    # Adjust by content length (longer content might be more important)
+    content_length_factor = min(content_length / 100, 2.0)  # Cap at 2x
+    base_importance *= content_length_factor
+    
+    return min(base_importance, 1.0)  # Cap at 1.0
+
+
+class _MemoryWriteBuffer:
+    """Background thread that inserts queued memory rows in batches.
+    
+    Each batch is written with one executemany INSERT in a single
+    transaction. A batch is everything queued while the previous one was
+    being written, so a lone row is written at once and bursts share a
+    transaction. Duplicate content is skipped like in store_memory, and each
+    queued row's future resolves to its memory id.
+    """
+    
+    def __init__(self, batch_size: int = MEMORY_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def enqueue(self, row: Dict[str, Any]) -> Future:
+        """Queue a memory row and return a future for its id."""
+        future: Future = Future()
+        self._queue.put((row, future))
+        
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        return future
+    
+    def flush(self) -> None:
+        """Block until every queued row has been written."""
+        self._queue.join()
+    
+    def _run(self) -> None:
+        """Write every queued row, up to batch_size at a time, as soon as it arrives."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        """Insert a batch of rows and resolve their futures with the memory ids."""
+        rows = [row for row, _ in batch]
+        try:
+            with get_db_session() as session, session.begin():
+                bulk_insert_memories(session, rows)
+                memory_ids = {
+                    (agent_id, content_hash): memory_id
+                    for agent_id, content_hash, memory_id in session.execute(
+                        select(Memory.agent_id, Memory.content_hash, Memory.id)
+                        .where(Memory.content_hash.in_({row["content_hash"] for row in rows}))
+                    )
+                }
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} queued memories: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        for row, future in batch:
+            future.set_result(memory_ids.get((row["agent_id"], row["content_hash"])))
+
+
+class _AccessBuffer:
+    """Combines memory access bookkeeping in memory and writes it periodically.
+    
+    Reads only record which memories they returned; a background thread
+    applies the accumulated access_count increments and latest accessed_at
+    values every interval seconds with one executemany UPDATE. Accesses not
+    yet written are lost on a crash, which is acceptable for these counters.
+    """
+    
+    def __init__(self, interval: float = ACCESS_FLUSH_INTERVAL):
+        self.interval = interval
+        # Memory id -> (pending access count, latest access time)
+        self._pending: Dict[int, Tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def record(self, memory_ids: List[int], accessed_at: datetime) -> Dict[int, int]:
+        """Record an access of each memory and return their pending access counts."""
+        with self._lock:
+            for memory_id in memory_ids:
+                count = self._pending.get(memory_id, (0, None))[0] + 1
+                self._pending[memory_id] = (count, accessed_at)
+            counts = {memory_id: self._pending[memory_id][0] for memory_id in memory_ids}
+            
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="memory-access-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        return counts
+    
+    def flush(self) -> None:
+        """Write every buffered access to the database."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            
+            try:
+                with get_db_session() as session, session.begin():
+                    session.execute(
+                        update(Memory.__table__)
+                        .where(Memory.__table__.c.id == bindparam("memory_id"))
+                        .values(
+                            access_count=Memory.__table__.c.access_count + bindparam("count"),
+                            accessed_at=bindparam("last_accessed")
+                        ),
+                        [
+                            {"memory_id": memory_id, "count": count, "last_accessed": accessed_at}
+                            for memory_id, (count, accessed_at) in pending.items()
+                        ]
+                    )
+            except Exception as e:
+                logger.error(f"Failed to write access counts of {len(pending)} memories: {e}")
+    
+    def _run(self) -> None:
+        """Flush buffered accesses every interval seconds."""
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
 class MemoryManager:
     """Manages hierarchical memory operations for agents."""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # Agent name -> (agent id, monotonic time looked up)
+        self._agent_id_cache: Dict[str, Tuple[int, float]] = {}
+        self._write_buffer = _MemoryWriteBuffer()
+        self._access_buffer = _AccessBuffer()
+        # retrieve_memories arguments -> (monotonic time built, result)
+        self._read_cache: "OrderedDict[tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+    
+    def _resolve_agent_id(self, session: Session, agent_name: str) -> Optional[int]:
+        """Return the id of the named agent, reusing recent lookups."""
+        cached = self._agent_id_cache.get(agent_name)
+        if cached and time.monotonic() - cached[1] < AGENT_ID_CACHE_TTL:
+            return cached[0]
+        
+        agent_id = session.query(Agent.id).filter_by(name=agent_name).scalar()
+        if agent_id is not None:
+            self._agent_id_cache[agent_name] = (agent_id, time.monotonic())
+        return agent_id
+    
+    def invalidate_agent(self, agent_name: str) -> None:
+        """Forget the cached id of an agent that was created, updated or deleted."""
+        self._agent_id_cache.pop(agent_name, None)
+        self._invalidate_reads(agent_name)
+    
+    def _invalidate_reads(self, agent_name: str) -> None:
+        """Drop cached retrieve_memories results of an agent whose memories changed."""
+        with self._read_cache_lock:
+            for key in [key for key in self._read_cache if key[0] == agent_name]:
+                del self._read_cache[key]
     
     def store_memory(
         self,
@@ -54,9 +324,8 @@ class MemoryManager:
         """Store a new memory for an agent."""
         try:
             with get_db_session() as session:
-                # Get agent
-                agent = session.query(Agent).filter(Agent.name == agent_name).first()
-                if not agent:
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
                     self.logger.error(f"Agent not found: {agent_name}")
                     return None
                 
@@ -64,34 +333,110 @@ class MemoryManager:
                 if importance is None:
                     importance = self._calculate_importance(memory_type, memory_category, content)
                 
-                # Create memory
-                memory = Memory(
-                    agent_id=agent.id,
-                    memory_type=memory_type,
-                    memory_category=memory_category,
-                    content=content,
-                    context=context,
-                    tags=tags or [],
-                    importance=importance,
-                    confidence=confidence,
-                    related_memories=related_memory_ids or []
-                )
-                
-                session.add(memory)
-                session.commit()
-                session.refresh(memory)
+                # Insert the memory unless the agent already stores identical content
+                content_hash = _content_hash(content)
+                values = {
+                    "agent_id": agent_id,
+                    "memory_type": memory_type,
+                    "memory_category": memory_category,
+                    "content": content,
+                    "content_hash": content_hash,
+                    "context": context,
+                    "tags": tags or [],
+                    "importance": importance,
+                    "confidence": confidence,
+                    "related_memories": related_memory_ids or []
+                }
+                insert = dialect_insert(session)
+                if insert is not None:
+                    memory_id = session.execute(
+                        insert(Memory)
+                        .values(**values)
+                        .on_conflict_do_nothing(index_elements=[Memory.agent_id, Memory.content_hash])
+                        .returning(Memory.id)
+                    ).scalar()
+                elif session.query(Memory.id).filter(
+                    Memory.agent_id == agent_id,
+                    Memory.content_hash == content_hash
+                ).first() is None:
+                    memory = Memory(**values)
+                    session.add(memory)
+                    session.flush()
+                    memory_id = memory.id
+                else:
+                    memory_id = None
+                
+                if memory_id is None:
+                    memory_id = session.query(Memory.id).filter(
+                        Memory.agent_id == agent_id,
+                        Memory.content_hash == content_hash
+                    ).scalar()
+                    self.logger.debug(f"Memory for {agent_name} already stored: {memory_id}")
+                    return memory_id
                 
                 # Create relationships if provided
                 if related_memory_ids:
-                    self._create_memory_relationships(session, memory.id, related_memory_ids)
+                    self._create_memory_relationships(session, memory_id, related_memory_ids)
+                
+                session.commit()
+                self._invalidate_reads(agent_name)
                 
-                self.logger.info(f"Stored {memory_type} memory for {agent_name}: {memory.id}")
-                return memory.id
+                self.logger.info(f"Stored {memory_type} memory for {agent_name}: {memory_id}")
+                return memory_id
                 
         except Exception as e:
             self.logger.error(f"Failed to store memory for {agent_name}: {e}")
             return None
     
+    def queue_memory(
+        self,
+        agent_name: str,
+        memory_type: str,
+        memory_category: str,
+        content: str,
+        context: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        importance: Optional[float] = None,
+        confidence: float = 1.0
+    ) -> Future:
+        """Queue a memory for a batched background insert.
+        
+        Returns a future that resolves to the memory id (None if the agent is
+        unknown) or raises if the batch failed. Unlike store_memory, related
+        memory ids are not supported. Call flush() to wait for queued writes.
+        """
+        with get_db_session() as session:
+            agent_id = self._resolve_agent_id(session, agent_name)
+        
+        if agent_id is None:
+            self.logger.error(f"Agent not found: {agent_name}")
+            future: Future = Future()
+            future.set_result(None)
+            return future
+        
+        if importance is None:
+            importance = self._calculate_importance(memory_type, memory_category, content)
+        
+        future = self._write_buffer.enqueue({
+            "agent_id": agent_id,
+            "memory_type": memory_type,
+            "memory_category": memory_category,
+            "content": content,
+            "content_hash": _content_hash(content),
+            "context": context,
+            "tags": tags or [],
+            "importance": importance,
+            "confidence": confidence,
+            "related_memories": []
+        })
+        future.add_done_callback(lambda _: self._invalidate_reads(agent_name))
+        return future
+    
+    def flush(self) -> None:
+        """Write every memory queued with queue_memory and all buffered accesses."""
+        self._write_buffer.flush()
+        self._access_buffer.flush()
+    
     def retrieve_memories(
         self,
         agent_name: str,
@@ -102,17 +447,30 @@ class MemoryManager:
         min_importance: float = 0.0,
         include_context: bool = True
     ) -> List[Dict[str, Any]]:
-        """Retrieve memories for an agent with filtering."""
+        """Retrieve memories for an agent with filtering.
+        
+        Results are reused for READ_CACHE_TTL seconds until the agent's
+        memories change; cached reads still count as accesses.
+        """
+        key = (
+            agent_name, memory_type, memory_category, tuple(tags or ()),
+            limit, min_importance, include_context
+        )
+        with self._read_cache_lock:
+            cached = self._read_cache.get(key)
+            if cached and time.monotonic() - cached[0] < READ_CACHE_TTL:
+                self._read_cache.move_to_end(key)
+                return self._record_cached_access(key, cached)
+        
         try:
-            with get_db_session() as session:
-                # Get agent
-                agent = session.query(Agent).filter(Agent.name == agent_name).first()
-                if not agent:
+            with get_db_session() as session, session.begin():
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
                     self.logger.error(f"Agent not found: {agent_name}")
                     return []
                 
-                # Build query
-                query = session.query(Memory).filter(Memory.agent_id == agent.id)
+                # Build query, loading only the columns the result uses
+                query = session.query(Memory).options(_RETRIEVE_COLUMNS).filter(Memory.agent_id == agent_id)
                 
                 if memory_type:
                     query = query.filter(Memory.memory_type == memory_type)
@@ -121,9 +479,13 @@ class MemoryManager:
                     query = query.filter(Memory.memory_category == memory_category)
                 
                 if tags:
-                    # Filter by tags (JSON array contains)
-                    for tag in tags:
-                        query = query.filter(Memory.tags.contains([tag]))
+                    if session.get_bind().dialect.name == "postgresql":
+                        # Contains-all check served by the GIN index on the JSONB tags
+                        query = query.filter(Memory.tags.op("?&")(array(tags)))
+                    else:
+                        # Filter by tags (JSON array contains)
+                        for tag in tags:
+                            query = query.filter(Memory.tags.contains([tag]))
                 
                 query = query.filter(Memory.importance >= min_importance)
                 
@@ -133,12 +495,8 @@ class MemoryManager:
                 # Limit results
                 memories = query.limit(limit).all()
                 
-                # Update access count and timestamp
-                for memory in memories:
-                    memory.access_count += 1
-                    memory.accessed_at = datetime.utcnow()
-                
-                session.commit()
+                # Record the access for the next access count write
+                self._record_access(memories)
                 
                 # Convert to dictionaries
                 result = []
@@ -161,8 +519,13 @@ class MemoryManager:
                         memory_dict["context"] = memory.context
                     
                     result.append(memory_dict)
-                
-                return result
+            
+            with self._read_cache_lock:
+                self._read_cache[key] = (time.monotonic(), result)
+                self._read_cache.move_to_end(key)
+                if len(self._read_cache) > READ_CACHE_SIZE:
+                    self._read_cache.popitem(last=False)
+            return [dict(memory_dict) for memory_dict in result]
                 
         except Exception as e:
             self.logger.error(f"Failed to retrieve memories for {agent_name}: {e}")
@@ -175,30 +538,24 @@ class MemoryManager:
         memory_type: Optional[str] = None,
         limit: int = 10
     ) -> List[Dict[str, Any]]:
-        """Search memories by content similarity (simple text search)."""
+        """Search memories by text.
+        
+        Uses full-text search on PostgreSQL and substring matching elsewhere.
+        """
         try:
-            with get_db_session() as session:
-                # Get agent
-                agent = session.query(Agent).filter(Agent.name == agent_name).first()
-                if not agent:
+            with get_db_session() as session, session.begin():
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
                     self.logger.error(f"Agent not found: {agent_name}")
                     return []
                 
                 # Build query
-                db_query = session.query(Memory).filter(Memory.agent_id == agent.id)
+                db_query = session.query(Memory).filter(Memory.agent_id == agent_id)
                 
                 if memory_type:
                     db_query = db_query.filter(Memory.memory_type == memory_type)
                 
-                # Simple text search (can be enhanced with vector search later)
-                search_terms = query.lower().split()
-                conditions = []
-                for term in search_terms:
-                    conditions.append(Memory.content.ilike(f"%{term}%"))
-                    conditions.append(Memory.context.ilike(f"%{term}%"))
-                
-                if conditions:
-                    db_query = db_query.filter(or_(*conditions))
+                db_query = self._apply_text_search(session, db_query, query)
                 
                 # Order by relevance (importance + recency)
                 db_query = db_query.order_by(
@@ -208,83 +565,179 @@ class MemoryManager:
                 
                 memories = db_query.limit(limit).all()
                 
-                # Update access counts
-                for memory in memories:
-                    memory.access_count += 1
-                    memory.accessed_at = datetime.utcnow()
-                
-                session.commit()
+                # Record the access for the next access count write
+                self._record_access(memories)
                 
                 # Convert to dictionaries
+                result = [self._search_result(memory) for memory in memories]
+                
+                return result
+                
+        except Exception as e:
+            self.logger.error(f"Failed to search memories for {agent_name}: {e}")
+            return []
+    
+    def hybrid_lexical_search(
+        self,
+        agent_name: str,
+        query: str,
+        memory_type: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search memories by fusing the text search ranking with term-vector similarity.
+        
+        Both rankings are lexical: up to HYBRID_CANDIDATES memories matching
+        the text search are ranked as search_memories ranks them and by cosine
+        similarity of their word counts to the query's, and the two rankings
+        are merged with reciprocal rank fusion.
+        """
+        try:
+            with get_db_session() as session, session.begin():
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
+                    self.logger.error(f"Agent not found: {agent_name}")
+                    return []
+                
+                base_query = session.query(Memory).filter(Memory.agent_id == agent_id)
+                if memory_type:
+                    base_query = base_query.filter(Memory.memory_type == memory_type)
+                
+                # Candidates are the text matches, in the order search_memories returns them
+                candidates = (
+                    self._apply_text_search(session, base_query, query)
+                    .order_by(desc(Memory.importance), desc(Memory.accessed_at))
+                    .limit(HYBRID_CANDIDATES)
+                    .all()
+                )
+                
+                # Rank the same candidates by similarity of their content and context to the query
+                query_vector, query_norm = term_vector(query)
+                similarities = []
+                for memory in candidates:
+                    vector, norm = term_vector(f"{memory.content} {memory.context or ''}")
+                    similarity = cosine_similarity(query_vector, query_norm, vector, norm)
+                    if similarity > 0:
+                        similarities.append((similarity, memory.id))
+                similarities.sort(reverse=True)
+                
+                # Reciprocal rank fusion of both rankings
+                scores: Dict[int, float] = {}
+                for ranking in ([memory.id for memory in candidates], [memory_id for _, memory_id in similarities]):
+                    for rank, memory_id in enumerate(ranking, 1):
+                        scores[memory_id] = scores.get(memory_id, 0.0) + 1.0 / (RRF_K + rank)
+                
+                by_id = {memory.id: memory for memory in candidates}
+                memories = [by_id[memory_id] for memory_id in sorted(scores, key=scores.get, reverse=True)[:limit]]
+                
+                self._record_access(memories)
+                
                 result = []
                 for memory in memories:
-                    result.append({
-                        "id": memory.id,
-                        "memory_type": memory.memory_type,
-                        "memory_category": memory.memory_category,
-                        "content": memory.content,
-                        "importance": memory.importance,
-                        "confidence": memory.confidence,
-                        "created_at": memory.created_at.isoformat(),
-                        "tags": memory.tags
-                    })
+                    memory_dict = self._search_result(memory)
+                    memory_dict["score"] = round(scores[memory.id], 6)
+                    result.append(memory_dict)
                 
                 return result
                 
         except Exception as e:
-            self.logger.error(f"Failed to search memories for {agent_name}: {e}")
+            self.logger.error(f"Failed hybrid lexical search for {agent_name}: {e}")
             return []
     
+    def _apply_text_search(self, session: Session, db_query, query: str):
+        """Filter a Memory query to text matches of the search query."""
+        if session.get_bind().dialect.name == "postgresql" and query.strip():
+            # Indexed full-text match on whole words, best matches first
+            search_vector = literal_column(MEMORY_SEARCH_VECTOR)
+            ts_query = func.plainto_tsquery("simple", query)
+            return db_query.filter(search_vector.op("@@")(ts_query)).order_by(
+                desc(func.ts_rank_cd(search_vector, ts_query))
+            )
+        
+        # Substring search for databases without full-text support
+        search_terms = query.lower().split()[:SEARCH_TERMS]
+        if not search_terms:
+            return db_query
+        
+        # Unused slots repeat the first term, which leaves the matches unchanged
+        search_terms += search_terms[:1] * (SEARCH_TERMS - len(search_terms))
+        return db_query.filter(_SEARCH_TERMS_FILTER).params({
+            f"search_term_{i}": f"%{term}%" for i, term in enumerate(search_terms)
+        })
+    
+    def _search_result(self, memory: Memory) -> Dict[str, Any]:
+        """Convert a memory to the dictionary returned by the search methods."""
+        return {
+            "id": memory.id,
+            "memory_type": memory.memory_type,
+            "memory_category": memory.memory_category,
+            "content": memory.content,
+            "importance": memory.importance,
+            "confidence": memory.confidence,
+            "created_at": memory.created_at.isoformat(),
+            "tags": memory.tags
+        }
+    
     def consolidate_memories(self, agent_name: str, memory_type: str = MemoryType.EPISODIC) -> int:
         """Consolidate episodic memories into semantic memories."""
+        # Consolidation depends on access counts, so apply buffered accesses first
+        self._access_buffer.flush()
         try:
             with get_db_session() as session:
-                # Get agent
-                agent = session.query(Agent).filter(Agent.name == agent_name).first()
-                if not agent:
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
                     self.logger.error(f"Agent not found: {agent_name}")
                     return 0
                 
-                # Get episodic memories that haven't been consolidated recently
+                # Get episodic memories that should be consolidated and haven't
+                # been recently, as plain rows of the columns used below
                 cutoff_date = datetime.utcnow() - timedelta(hours=24)
-                episodic_memories = session.query(Memory).filter(
+                episodic_memories = session.query(
+                    Memory.id, Memory.memory_category, Memory.content, Memory.context,
+                    Memory.tags, Memory.importance, Memory.confidence
+                ).filter(
                     and_(
-                        Memory.agent_id == agent.id,
+                        Memory.agent_id == agent_id,
                         Memory.memory_type == MemoryType.EPISODIC,
                         or_(
                             Memory.last_consolidated.is_(None),
                             Memory.last_consolidated < cutoff_date
-                        )
+                        ),
+                        self._consolidation_filter()
                     )
                 ).all()
                 
-                consolidated_count = 0
+                new_rows = []
+                consolidated_ids = []
                 
                 for memory in episodic_memories:
-                    # Check if this memory should be consolidated
-                    if self._should_consolidate(memory):
-                        # Create semantic memory from episodic memory
-                        semantic_content = self._consolidate_content(memory.content, memory.context)
-                        
-                        semantic_memory = Memory(
-                            agent_id=agent.id,
-                            memory_type=MemoryType.SEMANTIC,
-                            memory_category=memory.memory_category,
-                            content=semantic_content,
-                            context=f"Consolidated from episodic memory {memory.id}",
-                            tags=memory.tags,
-                            importance=min(memory.importance * 1.1, 1.0),  # Slight boost
-                            confidence=memory.confidence,
-                            related_memories=[memory.id]
-                        )
-                        
-                        session.add(semantic_memory)
-                        
-                        # Mark episodic memory as consolidated
-                        memory.last_consolidated = datetime.utcnow()
-                        consolidated_count += 1
+                    # Create semantic memory from episodic memory
+                    semantic_content = self._consolidate_content(memory.content, memory.context)
+                    
+                    new_rows.append({
+                        "agent_id": agent_id,
+                        "memory_type": MemoryType.SEMANTIC,
+                        "memory_category": memory.memory_category,
+                        "content": semantic_content,
+                        "content_hash": _content_hash(semantic_content),
+                        "context": f"Consolidated from episodic memory {memory.id}",
+                        "tags": memory.tags,
+                        "importance": min(memory.importance * 1.1, 1.0),  # Slight boost
+                        "confidence": memory.confidence,
+                        "related_memories": [memory.id]
+                    })
+                    consolidated_ids.append(memory.id)
+                
+                # Insert the semantic memories and mark their sources in two statements
+                if new_rows:
+                    bulk_insert_memories(session, new_rows)
+                    session.query(Memory).filter(Memory.id.in_(consolidated_ids)).update(
+                        {Memory.last_consolidated: datetime.utcnow()},
+                        synchronize_session=False
+                    )
                 
+                consolidated_count = len(consolidated_ids)
                 session.commit()
+                self._invalidate_reads(agent_name)
                 self.logger.info(f"Consolidated {consolidated_count} memories for {agent_name}")
                 return consolidated_count
                 
@@ -294,37 +747,39 @@ class MemoryManager:
     
     def decay_memories(self, agent_name: str, days_old: int = 30) -> int:
         """Decay old, low-importance memories."""
+        # Decay depends on access counts, so apply buffered accesses first
+        self._access_buffer.flush()
         try:
             with get_db_session() as session:
-                # Get agent
-                agent = session.query(Agent).filter(Agent.name == agent_name).first()
-                if not agent:
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
                     self.logger.error(f"Agent not found: {agent_name}")
                     return 0
                 
                 cutoff_date = datetime.utcnow() - timedelta(days=days_old)
                 
-                # Find memories to decay
-                memories_to_decay = session.query(Memory).filter(
-                    and_(
-                        Memory.agent_id == agent.id,
-                        Memory.created_at < cutoff_date,
-                        Memory.importance < 0.3,  # Low importance
-                        Memory.access_count < 5   # Rarely accessed
-                    )
-                ).all()
+                # Reduce the importance of old, low-importance, rarely accessed memories
+                decay_filter = and_(
+                    Memory.agent_id == agent_id,
+                    Memory.created_at < cutoff_date,
+                    Memory.access_count < 5   # Rarely accessed
+                )
+                session.query(Memory).filter(
+                    decay_filter,
+                    Memory.importance < 0.3  # Low importance
+                ).update(
+                    {Memory.importance: Memory.importance * 0.8},
+                    synchronize_session=False
+                )
                 
-                decayed_count = 0
-                for memory in memories_to_decay:
-                    # Reduce importance
-                    memory.importance *= 0.8
-                    
-                    # If importance is very low, mark for deletion
-                    if memory.importance < 0.1:
-                        session.delete(memory)
-                        decayed_count += 1
+                # Delete those whose importance is now very low
+                decayed_count = session.query(Memory).filter(
+                    decay_filter,
+                    Memory.importance < 0.1
+                ).delete(synchronize_session=False)
                 
                 session.commit()
+                self._invalidate_reads(agent_name)
                 self.logger.info(f"Decayed {decayed_count} memories for {agent_name}")
                 return decayed_count
                 
@@ -336,29 +791,26 @@ class MemoryManager:
         """Get memory statistics for an agent."""
         try:
             with get_db_session() as session:
-                # Get agent
-                agent = session.query(Agent).filter(Agent.name == agent_name).first()
-                if not agent:
+                agent_id = self._resolve_agent_id(session, agent_name)
+                if agent_id is None:
                     self.logger.error(f"Agent not found: {agent_name}")
                     return {}
                 
-                # Get counts by type
-                working_count = session.query(Memory).filter(
-                    and_(Memory.agent_id == agent.id, Memory.memory_type == MemoryType.WORKING)
-                ).count()
+                # Count and total importance per type in one aggregate query
+                rows = session.query(
+                    Memory.memory_type,
+                    func.count(Memory.id).label("count"),
+                    func.sum(Memory.importance).label("importance_sum")
+                ).filter(Memory.agent_id == agent_id).group_by(Memory.memory_type).all()
                 
-                episodic_count = session.query(Memory).filter(
-                    and_(Memory.agent_id == agent.id, Memory.memory_type == MemoryType.EPISODIC)
-                ).count()
+                counts = {row.memory_type: row.count for row in rows}
+                working_count = counts.get(MemoryType.WORKING, 0)
+                episodic_count = counts.get(MemoryType.EPISODIC, 0)
+                semantic_count = counts.get(MemoryType.SEMANTIC, 0)
                 
-                semantic_count = session.query(Memory).filter(
-                    and_(Memory.agent_id == agent.id, Memory.memory_type == MemoryType.SEMANTIC)
-                ).count()
-                
-                # Get average importance
-                avg_importance = session.query(func.avg(Memory.importance)).filter(
-                    Memory.agent_id == agent.id
-                ).scalar() or 0.0
+                total_count = sum(counts.values())
+                importance_sum = sum(row.importance_sum or 0.0 for row in rows)
+                avg_importance = importance_sum / total_count if total_count else 0.0
                 
                 return {
                     "agent_name": agent_name,
@@ -375,40 +827,54 @@ class MemoryManager:
     
     def _calculate_importance(self, memory_type: str, memory_category: str, content: str) -> float:
         """Calculate memory importance based on type, category, and content."""
-        base_importance = 0.5
-        
-        # Adjust by memory type
-        if memory_type == MemoryType.WORKING:
-            base_importance *= 0.7  # Working memory is less important
-        elif memory_type == MemoryType.SEMANTIC:
-            base_importance *= 1.2  # Semantic memory is more important
-        
-        # Adjust by category
-        if memory_category == MemoryCategory.SOLUTION:
-            base_importance *= 1.3  # Solutions are important
-        elif memory_category == MemoryCategory.PATTERN:
-            base_importance *= 1.2  # Patterns are important
-        elif memory_category == MemoryCategory.KNOWLEDGE:
-            base_importance *= 1.1  # Knowledge is important
-        
-        # Adjust by content length (longer content might be more important)
-        content_length_factor = min(len(content) / 100, 2.0)  # Cap at 2x
-        base_importance *= content_length_factor
-        
-        return min(base_importance, 1.0)  # Cap at 1.0
+        # The length factor stops growing at 200 characters, so longer content shares a cache entry
+        return _importance(memory_type, memory_category, min(len(content), 200))
     
-    def _should_consolidate(self, memory: Memory) -> bool:
-        """Determine if a memory should be consolidated."""
+    def _consolidation_filter(self):
+        """SQL condition selecting memories that should be consolidated."""
         # Consolidate if memory is important and has been accessed multiple times
-        return memory.importance > 0.6 and memory.access_count > 3
+        return and_(Memory.importance > 0.6, Memory.access_count > 3)
     
     def _consolidate_content(self, content: str, context: Optional[str]) -> str:
         """Consolidate episodic content into semantic content."""
         # Simple consolidation - can be enhanced with AI summarization
         if context:
-            return f"Learned: {content} (Context: {context})"
+            return _CONSOLIDATED_WITH_CONTEXT(content, context)
         else:
-            return f"Learned: {content}"
+            return _CONSOLIDATED(content)
+    
+    def _record_access(self, memories: List[Memory]) -> None:
+        """Buffer an access of each loaded memory for the periodic access count write."""
+        if not memories:
+            return
+        
+        now = datetime.utcnow()
+        pending = self._access_buffer.record([memory.id for memory in memories], now)
+        
+        # Show the buffered values on the loaded objects without marking them dirty
+        for memory in memories:
+            set_committed_value(memory, "access_count", memory.access_count + pending[memory.id])
+            set_committed_value(memory, "accessed_at", now)
+    
+    def _record_cached_access(
+        self,
+        key: tuple,
+        cached: Tuple[float, List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Buffer an access of each memory in a cached result and return a fresh copy.
+        
+        Must be called with the read cache lock held.
+        """
+        built_at, result = cached
+        now = datetime.utcnow()
+        self._access_buffer.record([memory_dict["id"] for memory_dict in result], now)
+        
+        result = [
+            dict(memory_dict, access_count=memory_dict["access_count"] + 1, accessed_at=now.isoformat())
+            for memory_dict in result
+        ]
+        self._read_cache[key] = (built_at, result)
+        return [dict(memory_dict) for memory_dict in result]
     
     def _create_memory_relationships(
         self,
@@ -416,15 +882,19 @@ class MemoryManager:
         memory_id: int,
         related_memory_ids: List[int]
     ) -> None:
-        """Create relationships between memories."""
-        for related_id in related_memory_ids:
-            relationship = MemoryRelationship(
-                source_memory_id=memory_id,
-                target_memory_id=related_id,
-                relationship_type="related",
-                strength=1.0
-            )
-            session.add(relationship)
+        """Create relationships between memories with one bulk INSERT."""
+        session.execute(
+            MemoryRelationship.__table__.insert(),
+            [
+                {
+                    "source_memory_id": memory_id,
+                    "target_memory_id": related_id,
+                    "relationship_type": "related",
+                    "strength": 1.0
+                }
+                for related_id in related_memory_ids
+            ]
+        )
 
 
 # Global memory manager instance
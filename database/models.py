@@ -2,13 +2,49 @@
 SQLAlchemy database models for the multi-agent system.
 """
 
-from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Float, Index, LargeBinary, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
 
-Base = declarative_base()
+
+class utcnow(FunctionElement):
+    """Current UTC time, evaluated by the database."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element, compiler, **kw):
+    # Millisecond precision, padded to the format SQLAlchemy stores DateTime values in
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+
+class _ModelBase:
+    """Mapper settings shared by all models."""
+    # Read timestamps the database generated back with RETURNING after each
+    # INSERT/UPDATE, so they are available without another SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_ModelBase)
+
+# Full-text search document for memories on PostgreSQL; queries must use this
+# exact expression to match the idx_memories_fts GIN index
+MEMORY_SEARCH_VECTOR = "to_tsvector('simple', coalesce(content, '') || ' ' || coalesce(context, ''))"
 
 
 class Agent(Base):
@@ -25,13 +61,13 @@ class Agent(Base):
     enabled = Column(Boolean, default=True)
     memory_enabled = Column(Boolean, default=True)
     max_context_length = Column(Integer, default=4000)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
-    # Relationships
-    states = relationship("AgentState", back_populates="agent")
-    messages = relationship("Message", back_populates="agent")
-    tasks = relationship("Task", back_populates="agent")
+    # Relationships; never lazy-loaded, so queries must eager-load them explicitly
+    states = relationship("AgentState", back_populates="agent", lazy="raise")
+    messages = relationship("Message", back_populates="agent", lazy="raise")
+    tasks = relationship("Task", back_populates="agent", lazy="raise")
 
 
 class AgentState(Base):
@@ -43,13 +79,13 @@ class AgentState(Base):
     status = Column(String(20), nullable=False, default="idle")
     current_task = Column(String(200), nullable=True)
     memory_usage = Column(Integer, default=0)
-    last_activity = Column(DateTime, default=datetime.utcnow)
+    last_activity = Column(DateTime, default=utcnow(), server_default=utcnow())
     agent_metadata = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
-    # Relationships
-    agent = relationship("Agent", back_populates="states")
+    # Relationships; never lazy-loaded, so queries must eager-load it explicitly
+    agent = relationship("Agent", back_populates="states", lazy="raise")
 
 
 class Conversation(Base):
@@ -59,12 +95,12 @@ class Conversation(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     participants = Column(JSON, nullable=False)  # List of agent names
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     conversation_metadata = Column(JSON, nullable=True)
     
-    # Relationships
-    messages = relationship("Message", back_populates="conversation")
+    # Relationships; never lazy-loaded, so queries must eager-load it explicitly
+    messages = relationship("Message", back_populates="conversation", lazy="raise")
 
 
 class Message(Base):
@@ -76,12 +112,17 @@ class Message(Base):
     agent_id = Column(Integer, ForeignKey("agents.id"), nullable=True)
     message_type = Column(String(20), nullable=False)  # user, assistant, system, error
     content = Column(Text, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    message_metadata = Column(JSON, nullable=True)
+    timestamp = Column(DateTime, default=utcnow(), server_default=utcnow(), index=True)
+    message_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     
-    # Relationships
-    conversation = relationship("Conversation", back_populates="messages")
-    agent = relationship("Agent", back_populates="messages")
+    # Relationships; never lazy-loaded, so queries must eager-load them explicitly
+    conversation = relationship("Conversation", back_populates="messages", lazy="raise")
+    agent = relationship("Agent", back_populates="messages", lazy="raise")
+    
+    __table_args__ = (
+        # A conversation's messages in order
+        Index("ix_msg_conversation_ts", "conversation_id", "timestamp"),
+    )
 
 
 class Task(Base):
@@ -94,17 +135,17 @@ class Task(Base):
     task_type = Column(String(50), nullable=False)
     description = Column(Text, nullable=False)
     priority = Column(Integer, default=1)
-    parameters = Column(JSON, nullable=True)
+    parameters = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     status = Column(String(20), default="pending")  # pending, running, completed, failed
-    result = Column(JSON, nullable=True)
+    result = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     error_message = Column(Text, nullable=True)
     execution_time = Column(Float, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), index=True)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
-    # Relationships
-    agent = relationship("Agent", back_populates="tasks")
+    # Relationships; never lazy-loaded, so queries must eager-load it explicitly
+    agent = relationship("Agent", back_populates="tasks", lazy="raise")
 
 
 class Memory(Base):
@@ -120,8 +161,9 @@ class Memory(Base):
     
     # Content and context
     content = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # blake2b of content, unique per agent
     context = Column(Text, nullable=True)  # Additional context for the memory
-    tags = Column(JSON, nullable=True)  # List of tags for categorization
+    tags = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # List of tags for categorization
     
     # Memory attributes
     importance = Column(Float, default=0.5)  # 0.0 to 1.0, calculated dynamically
@@ -129,16 +171,28 @@ class Memory(Base):
     access_count = Column(Integer, default=0)  # How many times this memory has been accessed
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    accessed_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), index=True)
+    accessed_at = Column(DateTime, default=utcnow(), server_default=utcnow())
     last_consolidated = Column(DateTime, nullable=True)  # When this memory was last consolidated
     
     # Relationships and metadata
-    related_memories = Column(JSON, nullable=True)  # List of related memory IDs
-    memory_metadata = Column(JSON, nullable=True)  # Additional metadata
+    related_memories = Column(JSON().with_variant(ARRAY(Integer), "postgresql"), nullable=True)  # List of related memory IDs
+    memory_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Additional metadata
+    
+    # Relationships; never lazy-loaded, so queries must eager-load it explicitly
+    agent = relationship("Agent", lazy="raise")
     
-    # Relationships
-    agent = relationship("Agent")
+    __table_args__ = (
+        # Match the filter and ordering patterns of MemoryManager queries
+        Index("ix_mem_agent_type_imp", "agent_id", "memory_type", "importance"),
+        Index("ix_mem_agent_type_cat", "agent_id", "memory_type", "memory_category"),
+        Index("ix_mem_agent_imp_acc", "agent_id", "importance", "accessed_at"),
+        Index("ix_mem_agent_created", "agent_id", "created_at"),
+        Index("ux_mem_agent_content_hash", "agent_id", "content_hash", unique=True),
+        Index("ix_mem_tags_gin", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("ix_mem_related_gin", "related_memories", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("idx_memories_fts", text(MEMORY_SEARCH_VECTOR), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 
 class MemoryRelationship(Base):
@@ -150,11 +204,15 @@ class MemoryRelationship(Base):
     target_memory_id = Column(Integer, ForeignKey("memories.id"), nullable=False)
     relationship_type = Column(String(50), nullable=False)  # similar, related, contradicts, extends
     strength = Column(Float, default=1.0)  # 0.0 to 1.0, strength of the relationship
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    
+    # Relationships; never lazy-loaded, so queries must eager-load them explicitly
+    source_memory = relationship("Memory", foreign_keys=[source_memory_id], lazy="raise")
+    target_memory = relationship("Memory", foreign_keys=[target_memory_id], lazy="raise")
     
-    # Relationships
-    source_memory = relationship("Memory", foreign_keys=[source_memory_id])
-    target_memory = relationship("Memory", foreign_keys=[target_memory_id])
+    __table_args__ = (
+        Index("ix_memrel_source_type", "source_memory_id", "relationship_type"),
+    )
 
 
 class CodeReview(Base):
@@ -163,14 +221,14 @@ class CodeReview(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     agent_id = Column(Integer, ForeignKey("agents.id"), nullable=False)
-    code_hash = Column(String(64), index=True, nullable=False)
+    code_hash = Column(LargeBinary(32), index=True, nullable=False)  # Raw 32-byte digest
     language = Column(String(20), nullable=False)
     review = Column(Text, nullable=False)
     suggestions = Column(JSON, nullable=True)  # List of suggestions
     issues = Column(JSON, nullable=True)  # List of issues
     score = Column(Float, nullable=True)
     confidence = Column(Float, default=1.0)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
     
-    # Relationships
-    agent = relationship("Agent") 
\ No newline at end of file
+    # Relationships; never lazy-loaded, so queries must eager-load it explicitly
+    agent = relationship("Agent", lazy="raise") 
\ No newline at end of file
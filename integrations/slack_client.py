@@ -17,6 +17,7 @@ import re
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import aiohttp
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
 from slack_sdk.web.async_client import AsyncWebClient
 
 from shared.config import get_config
@@ -25,10 +26,37 @@ from agents.manager import AgentManager
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by all Slack API calls of a client
+SLACK_POOL_SIZE = 20  # concurrent connections to Slack
+SLACK_KEEPALIVE_TIMEOUT = 75  # seconds an idle connection stays open
+SLACK_DNS_CACHE_TTL = 300  # seconds resolved Slack hosts are reused
+SLACK_RATE_LIMIT_RETRIES = 3  # retries of a rate-limited call after its Retry-After delay
+SLACK_FANOUT_CONCURRENCY = 5  # channels messaged at once by send_message_to_all_channels
+
+# Phrasings that mark a message as a task request
+TASK_REQUEST_PATTERNS = [
+    r"can you (create|build|develop|implement)",
+    r"i need (a|an|some)",
+    r"please (create|build|develop|implement)",
+    r"add (a|an|some)",
+    r"new (feature|functionality|component)"
+]
+
+# Block shared by every agent response; Slack only reads it
+_DIVIDER_BLOCK = {"type": "divider"}
+
+
+def _keyword_regex(keywords: List[str]) -> str:
+    """Build a regex alternation matching any of the keywords as a substring."""
+    return "|".join(map(re.escape, keywords))
+
 
 class SlackClient:
     """Enhanced Slack client for requirements intake and agent communication."""
     
+    # Bot mention markup (format: <@BOT_ID>)
+    _MENTION_RE = re.compile(r'<@[A-Z0-9]+>')
+    
     def __init__(self):
         """Initialize the Slack client."""
         self.config = get_config()
@@ -40,8 +68,9 @@ class SlackClient:
         self.channels = self.config.integrations.slack.channels
         self.enabled = self.config.integrations.slack.enabled
         
-        # Initialize Slack web client
+        # Initialize Slack web client and the HTTP session it sends requests on
         self.web_client = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
         
         # Task keywords for requirements detection
         self.requirement_keywords = [
@@ -58,6 +87,17 @@ class SlackClient:
             "agentic_software_developer": ["create", "build", "develop", "implement", "generate", "code"]
         }
         
+        # Compile the keyword checks once; matching ignores case instead of
+        # lowercasing every message
+        self._task_request_re = re.compile(
+            "|".join([_keyword_regex(self.requirement_keywords), *TASK_REQUEST_PATTERNS]),
+            re.IGNORECASE
+        )
+        self._agent_keyword_res = [
+            (agent_name, re.compile(_keyword_regex(keywords), re.IGNORECASE))
+            for agent_name, keywords in self.agent_keywords.items()
+        ]
+        
         logger.info(f"Slack client initialized - Enabled: {self.enabled}")
     
     async def initialize(self, agent_manager: AgentManager):
@@ -73,8 +113,21 @@ class SlackClient:
         self.agent_manager = agent_manager
         
         try:
-            # Initialize web client
-            self.web_client = AsyncWebClient(token=self.bot_token)
+            # Initialize web client on a pooled session so calls reuse
+            # TCP/TLS connections; a reconnect replaces the old session
+            await self.close()
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=SLACK_POOL_SIZE,
+                    keepalive_timeout=SLACK_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=SLACK_DNS_CACHE_TTL
+                )
+            )
+            self.web_client = AsyncWebClient(token=self.bot_token, session=self._http_session)
+            # Wait out Slack's Retry-After and retry instead of failing rate-limited calls
+            self.web_client.retry_handlers.append(
+                AsyncRateLimitErrorRetryHandler(max_retry_count=SLACK_RATE_LIMIT_RETRIES)
+            )
             
             # Test connection
             auth_test = await self.web_client.auth_test()
@@ -86,6 +139,13 @@ class SlackClient:
             logger.error(f"Failed to initialize Slack client: {e}")
             raise
     
+    async def close(self):
+        """Close the HTTP session used for Slack API calls."""
+        self.web_client = None
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+    
     async def send_message(self, channel: str, message: str, thread_ts: Optional[str] = None, blocks: Optional[List[Dict]] = None):
         """Send a message to a Slack channel with optional rich formatting."""
         if not self.enabled or not self.web_client:
@@ -129,9 +189,7 @@ class SlackClient:
                         "text": f"🤖 *{agent_name.replace('_', ' ').title()}* has completed your request:"
                     }
                 },
-                {
-                    "type": "divider"
-                }
+                _DIVIDER_BLOCK
             ]
             
             # Add response content
@@ -169,7 +227,7 @@ class SlackClient:
                 "elements": [
                     {
                         "type": "mrkdwn",
-                        "text": f"Completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                        "text": f"Completed at {datetime.now().isoformat(sep=' ', timespec='seconds')}"
                     }
                 ]
             })
@@ -183,17 +241,18 @@ class SlackClient:
             await self.send_message(channel, f"🤖 {agent_name}: {response.get('response', 'Task completed')}", thread_ts)
     
     async def send_message_to_all_channels(self, message: str):
-        """Send a message to all configured channels."""
+        """Send a message to all configured channels, several at a time."""
         if not self.channels:
             logger.warning("No channels configured")
             return
         
-        results = []
-        for channel in self.channels:
-            success = await self.send_message(channel, message)
-            results.append({"channel": channel, "success": success})
+        semaphore = asyncio.Semaphore(SLACK_FANOUT_CONCURRENCY)
         
-        return results
+        async def send(channel: str) -> Dict[str, Any]:
+            async with semaphore:
+                return {"channel": channel, "success": await self.send_message(channel, message)}
+        
+        return list(await asyncio.gather(*(send(channel) for channel in self.channels)))
     
     async def get_channel_info(self, channel: str) -> Optional[Dict[str, Any]]:
         """Get information about a channel."""
@@ -317,34 +376,12 @@ class SlackClient:
     
     def _extract_message_from_mention(self, text: str) -> str:
         """Extract the actual message from a bot mention."""
-        # Remove the bot mention (format: <@BOT_ID> message)
-        # This is a simple regex to remove the mention
-        import re
-        return re.sub(r'<@[A-Z0-9]+>', '', text).strip()
+        return self._MENTION_RE.sub('', text).strip()
     
     def _is_task_request(self, text: str) -> bool:
         """Check if a message looks like a task request."""
-        text_lower = text.lower()
-        
-        # Check for requirement keywords
-        for keyword in self.requirement_keywords:
-            if keyword in text_lower:
-                return True
-        
-        # Check for specific patterns
-        patterns = [
-            r"can you (create|build|develop|implement)",
-            r"i need (a|an|some)",
-            r"please (create|build|develop|implement)",
-            r"add (a|an|some)",
-            r"new (feature|functionality|component)"
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        # One scan for the requirement keywords and the specific patterns
+        return self._task_request_re.search(text) is not None
     
     async def _process_task_request(self, text: str, user: str, channel: str, thread_ts: str):
         """Process a task request and route to appropriate agent."""
@@ -395,13 +432,10 @@ class SlackClient:
     
     def _determine_agent_for_task(self, text: str) -> str:
         """Determine the best agent for a given task."""
-        text_lower = text.lower()
-        
-        # Check agent-specific keywords
-        for agent_name, keywords in self.agent_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return agent_name
+        # Check agent-specific keywords, in priority order
+        for agent_name, keyword_re in self._agent_keyword_res:
+            if keyword_re.search(text):
+                return agent_name
         
         # Default to agentic_software_developer for general requests
         return "agentic_software_developer"
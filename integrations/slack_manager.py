@@ -62,6 +62,7 @@ class SlackManager:
         """Stop the Slack manager."""
         try:
             self._running = False
+            await self.slack_client.close()
             logger.info("Slack manager stopped")
         except Exception as e:
             logger.error(f"Error stopping Slack manager: {e}")
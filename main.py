@@ -118,8 +118,8 @@ async def health_check():
         config = get_config()
         db_manager = get_db_manager()
         
-        # Check database health
-        db_health = db_manager.health_check()
+        # Check database liveness; table counts are served by /database/health
+        db_health = db_manager.health_check(deep=False)
         
         # Check agents health
         agent_manager = await get_agent_manager()
@@ -215,6 +215,51 @@ async def submit_task(agent_name: str, task_request: TaskRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/agents/{agent_name}/tasks/submit", status_code=202)
+async def submit_background_task(agent_name: str, task_request: TaskRequest):
+    """Submit a task to run in the background and return its id immediately."""
+    try:
+        task_request.agent_name = agent_name
+        
+        agent_manager = await get_agent_manager()
+        agent = await agent_manager.get_agent(agent_name)
+        
+        if not agent:
+            raise HTTPException(status_code=404, detail=f"Agent not found: {agent_name}")
+        
+        task_id = agent.submit_task(task_request)
+        return {"task_id": task_id, "status": "pending"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to submit background task to {agent_name}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/agents/{agent_name}/tasks/{task_id}")
+async def get_background_task(agent_name: str, task_id: str):
+    """Get the status of a background task."""
+    try:
+        agent_manager = await get_agent_manager()
+        agent = await agent_manager.get_agent(agent_name)
+        
+        if not agent:
+            raise HTTPException(status_code=404, detail=f"Agent not found: {agent_name}")
+        
+        task = agent.get_submitted_task(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail=f"Task not found: {task_id}")
+        
+        return task
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get background task {task_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/tasks", response_model=TaskResponse)
 async def submit_task_to_any_agent(task_request: TaskRequest):
     """Submit a task to any available agent."""
@@ -291,7 +336,7 @@ async def database_health():
     """Get database health information."""
     try:
         db_manager = get_db_manager()
-        return db_manager.health_check()
+        return db_manager.health_check(deep=True)
         
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -2,6 +2,7 @@
 Configuration management for the multi-agent system.
 """
 
+import functools
 import os
 import yaml
 from typing import List, Optional
@@ -22,6 +23,12 @@ class DatabaseConfig(BaseModel):
     path: str = "./database/agents.db"
     backup_enabled: bool = True
     backup_interval: int = 3600  # seconds
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30  # seconds
+    pool_recycle: int = 1800  # seconds
+    count_cache_ttl: float = 30.0  # seconds health_check reuses table counts
+    query_cache_ttl: float = 1.0  # seconds execute_query reuses SELECT results (0 disables)
 
 
 class APIConfig(BaseModel):
@@ -30,6 +37,8 @@ class APIConfig(BaseModel):
     port: int = 8000
     workers: int = 4
     timeout: int = 30
+    states_cache_ttl: float = 1.0  # seconds agent state snapshots are reused
+    health_cache_ttl: float = 5.0  # seconds per-agent health results are reused
 
 
 class LLMConfig(BaseModel):
@@ -53,6 +62,12 @@ class AgentConfig(BaseModel):
     memory_enabled: bool = True
     max_context_length: int = 4000
     llm_config: Optional[LLMConfig] = None
+    # Reuse LLM responses for near-identical prompts; off by default because
+    # a similar prompt can still ask for something different
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = 0.95  # minimum cosine similarity for a hit
+    semantic_cache_ttl: int = 3600  # seconds
+    max_concurrent_llm_calls: int = 8
 
 
 class SlackConfig(BaseModel):
@@ -112,12 +127,20 @@ def load_config_from_env() -> Config:
     config.database.path = os.getenv("DATABASE_PATH", config.database.path)
     config.database.backup_enabled = os.getenv("DATABASE_BACKUP_ENABLED", "true").lower() == "true"
     config.database.backup_interval = int(os.getenv("DATABASE_BACKUP_INTERVAL", str(config.database.backup_interval)))
+    config.database.pool_size = int(os.getenv("DATABASE_POOL_SIZE", str(config.database.pool_size)))
+    config.database.max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", str(config.database.max_overflow)))
+    config.database.pool_timeout = int(os.getenv("DATABASE_POOL_TIMEOUT", str(config.database.pool_timeout)))
+    config.database.pool_recycle = int(os.getenv("DATABASE_POOL_RECYCLE", str(config.database.pool_recycle)))
+    config.database.count_cache_ttl = float(os.getenv("DATABASE_COUNT_CACHE_TTL", str(config.database.count_cache_ttl)))
+    config.database.query_cache_ttl = float(os.getenv("DATABASE_QUERY_CACHE_TTL", str(config.database.query_cache_ttl)))
     
     # API configuration
     config.api.host = os.getenv("API_HOST", config.api.host)
     config.api.port = int(os.getenv("API_PORT", str(config.api.port)))
     config.api.workers = int(os.getenv("API_WORKERS", str(config.api.workers)))
     config.api.timeout = int(os.getenv("API_TIMEOUT", str(config.api.timeout)))
+    config.api.states_cache_ttl = float(os.getenv("API_STATES_CACHE_TTL", str(config.api.states_cache_ttl)))
+    config.api.health_cache_ttl = float(os.getenv("API_HEALTH_CACHE_TTL", str(config.api.health_cache_ttl)))
     
     # Logging configuration
     config.logging.level = os.getenv("LOG_LEVEL", config.logging.level)
@@ -220,6 +243,7 @@ def reload_config():
     """Reload the configuration."""
     global _config
     _config = None
+    get_agent_config.cache_clear()
     return get_config()
 
 
@@ -238,8 +262,12 @@ def get_google_api_key() -> str:
     return os.getenv("GOOGLE_API_KEY", "")
 
 
+@functools.lru_cache(maxsize=None)
 def get_agent_config(agent_name: str) -> Optional[AgentConfig]:
-    """Get configuration for a specific agent."""
+    """Get configuration for a specific agent.
+    
+    Results are cached per name; reload_config() clears the cache.
+    """
     config = get_config()
     for agent in config.agents:
         if agent.name == agent_name:
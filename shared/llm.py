@@ -5,6 +5,7 @@ LLM abstraction layer supporting multiple providers (Ollama, OpenAI, Claude, Gem
 import asyncio
 import logging
 import os
+import threading
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Literal
 from dataclasses import dataclass
@@ -28,6 +29,7 @@ class LLMConfig:
     base_url: Optional[str] = None
     max_tokens: int = 4000
     temperature: float = 0.7
+    max_concurrency: int = 8  # concurrent requests allowed per registered client
 
 
 @dataclass
@@ -327,12 +329,19 @@ class LLMManager:
     
     def __init__(self):
         self.clients: Dict[str, LLMClient] = {}
+        # Agents register their clients from constructor worker threads
+        self._clients_lock = threading.Lock()
         self.conversation_history: Dict[str, List[LLMMessage]] = {}
         self.logger = logging.getLogger(__name__)
+        # Per-client call limits, created on demand and dropped when idle
+        self._call_limits: Dict[str, asyncio.Semaphore] = {}
+        self._call_users: Dict[str, int] = {}
     
     def register_client(self, name: str, config: LLMConfig) -> None:
         """Register an LLM client."""
-        self.clients[name] = LLMFactory.create_client(config)
+        client = LLMFactory.create_client(config)
+        with self._clients_lock:
+            self.clients[name] = client
         self.logger.info(f"Registered LLM client: {name} ({config.provider}/{config.model})")
     
     def get_client(self, name: str) -> LLMClient:
@@ -361,27 +370,106 @@ class LLMManager:
             all_messages = messages
         
         # Generate response
-        response = await client.generate(all_messages, max_tokens, temperature)
+        response = await self._limited_generate(client_name, client, all_messages, max_tokens, temperature)
         
         # Update conversation history
         if conversation_id:
-            if conversation_id not in self.conversation_history:
-                self.conversation_history[conversation_id] = []
-            
-            # Add new messages to history
-            self.conversation_history[conversation_id].extend(messages)
-            
-            # Add assistant response to history
-            self.conversation_history[conversation_id].append(
-                LLMMessage(role="assistant", content=response)
-            )
-            
-            # Limit history length (keep last 20 messages)
-            if len(self.conversation_history[conversation_id]) > 20:
-                self.conversation_history[conversation_id] = self.conversation_history[conversation_id][-20:]
+            self._record_history(conversation_id, messages, response)
         
         return response
     
+    async def generate_response_batch(
+        self,
+        client_name: str,
+        message_lists: List[List[LLMMessage]],
+        conversation_id: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        include_history: bool = True,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Generate responses for several message lists in one batch.
+        
+        Identical message lists are sent once and share the response; the rest
+        run concurrently within the client's concurrency limit. All prompts see
+        the same conversation history, and each exchange is appended to it in
+        order afterwards. With return_exceptions, failed prompts yield their
+        exception instead of raising.
+        """
+        client = self.get_client(client_name)
+        history = []
+        if include_history and conversation_id:
+            history = list(self.conversation_history.get(conversation_id, []))
+        
+        # Deduplicate identical prompts
+        unique: Dict[tuple, int] = {}
+        slots = []
+        for messages in message_lists:
+            key = tuple((message.role, message.content) for message in messages)
+            slots.append(unique.setdefault(key, len(unique)))
+        unique_lists = [None] * len(unique)
+        for messages, slot in zip(message_lists, slots):
+            unique_lists[slot] = messages
+        
+        results = await asyncio.gather(
+            *(
+                self._limited_generate(client_name, client, history + messages, max_tokens, temperature)
+                for messages in unique_lists
+            ),
+            return_exceptions=True
+        )
+        
+        responses = []
+        for messages, slot in zip(message_lists, slots):
+            response = results[slot]
+            if isinstance(response, BaseException):
+                if not return_exceptions:
+                    raise response
+            elif conversation_id:
+                self._record_history(conversation_id, messages, response)
+            responses.append(response)
+        return responses
+    
+    async def _limited_generate(
+        self,
+        client_name: str,
+        client: LLMClient,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int],
+        temperature: Optional[float]
+    ) -> str:
+        """Call the client, limiting concurrent requests per client."""
+        semaphore = self._call_limits.get(client_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(client.config.max_concurrency)
+            self._call_limits[client_name] = semaphore
+        self._call_users[client_name] = self._call_users.get(client_name, 0) + 1
+        try:
+            async with semaphore:
+                return await client.generate(messages, max_tokens, temperature)
+        finally:
+            self._call_users[client_name] -= 1
+            if not self._call_users[client_name]:
+                del self._call_users[client_name]
+                del self._call_limits[client_name]
+    
+    def _record_history(self, conversation_id: str, messages: List[LLMMessage], response: str) -> None:
+        """Append an exchange to a conversation's history, keeping the last 20 messages."""
+        if conversation_id not in self.conversation_history:
+            self.conversation_history[conversation_id] = []
+        
+        # Add new messages to history
+        self.conversation_history[conversation_id].extend(messages)
+        
+        # Add assistant response to history
+        self.conversation_history[conversation_id].append(
+            LLMMessage(role="assistant", content=response)
+        )
+        
+        # Limit history length (keep last 20 messages)
+        if len(self.conversation_history[conversation_id]) > 20:
+            self.conversation_history[conversation_id] = self.conversation_history[conversation_id][-20:]
+    
     def clear_conversation_history(self, conversation_id: str) -> None:
         """Clear conversation history for a specific conversation."""
         if conversation_id in self.conversation_history:
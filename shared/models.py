@@ -96,6 +96,15 @@ class TaskResponse(BaseModel):
     completed_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class BatchProgress(BaseModel):
+    """Progress of a batch of tasks run by one agent."""
+    agent_name: str
+    total: int
+    completed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+
 class CodeReviewRequest(BaseModel):
     """Request for code review."""
     code: str
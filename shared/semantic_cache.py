@@ -0,0 +1,104 @@
+"""
+Similarity cache for LLM responses.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def term_vector(text: str) -> Tuple[Dict[str, int], float]:
+    """Build a term-frequency vector and its norm for a piece of text."""
+    vector = Counter(_TOKEN_RE.findall(text.lower()))
+    norm = math.sqrt(sum(count * count for count in vector.values()))
+    return vector, norm
+
+
+def _prompt_vector(text: str) -> Tuple[Dict[str, int], float]:
+    """Build a term vector of the words and adjacent word pairs of a prompt.
+    
+    The word pairs make the vector depend on word order, so prompts that
+    differ only in the order of their words ("convert A to B" and "convert
+    B to A") are not considered the same.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    vector = Counter(tokens)
+    vector.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    norm = math.sqrt(sum(count * count for count in vector.values()))
+    return vector, norm
+
+
+def cosine_similarity(
+    vector: Dict[str, int], norm: float, other: Dict[str, int], other_norm: float
+) -> float:
+    """Cosine similarity of two term vectors built by term_vector."""
+    if not norm or not other_norm:
+        return 0.0
+    if len(other) < len(vector):
+        vector, other = other, vector
+    dot = sum(count * other.get(term, 0) for term, count in vector.items())
+    return dot / (norm * other_norm)
+
+
+class SemanticCache:
+    """Cache that returns a stored response for prompts similar to a previous one.
+
+    Prompts are compared by cosine similarity of vectors counting their words
+    and adjacent word pairs, so prompts that share almost all of their words
+    in the same order hit the cache while reordered or unrelated prompts do
+    not. Entries expire after ttl seconds and the oldest
+    entry is dropped once max_entries is reached.
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl: float = 3600.0, max_entries: int = 256):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: List[Tuple[float, Dict[str, int], float, str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the cached response for the most similar prompt above the threshold."""
+        vector, norm = _prompt_vector(prompt)
+        if not norm:
+            return None
+
+        cutoff = time.monotonic() - self.ttl
+        best_score = 0.0
+        best_response = None
+        with self._lock:
+            self._entries = [entry for entry in self._entries if entry[0] >= cutoff]
+            for _, entry_vector, entry_norm, response in self._entries:
+                score = cosine_similarity(vector, norm, entry_vector, entry_norm)
+                if score > best_score:
+                    best_score = score
+                    best_response = response
+
+            if best_score >= self.threshold:
+                self.hits += 1
+                return best_response
+            self.misses += 1
+            return None
+
+    def put(self, prompt: str, response: str):
+        """Store a response for a prompt."""
+        vector, norm = _prompt_vector(prompt)
+        if not norm:
+            return
+
+        with self._lock:
+            self._entries.append((time.monotonic(), vector, norm, response))
+            if len(self._entries) > self.max_entries:
+                self._entries.pop(0)
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,32 @@
+"""
+JSON serialization helpers for the multi-agent system.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize an object to a JSON string, using orjson when available.
+
+    default is called for objects that are not natively serializable.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson rejects some values the stdlib accepts (e.g. huge ints)
+            pass
+    return json.dumps(obj, default=default)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize a JSON string or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
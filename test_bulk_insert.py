@@ -0,0 +1,125 @@
+"""
+Unit tests for bulk_insert and the CSV fields it streams to PostgreSQL COPY.
+"""
+
+import csv
+import io
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+from database.manager import COPY_MIN_ROWS, _copy_field, bulk_insert
+from database.models import Memory
+from shared.serialization import loads as json_loads
+
+
+class FakeCursor:
+    """psycopg2 cursor stand-in that captures the COPY statement and its data."""
+    
+    def __init__(self):
+        self.sql = None
+        self.data = None
+    
+    def copy_expert(self, sql, buffer):
+        self.sql = sql
+        self.data = buffer.read()
+    
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Session stand-in bound to a given dialect."""
+    
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.cursor = FakeCursor()
+        self.executed = []
+    
+    def get_bind(self):
+        return SimpleNamespace(dialect=self.dialect)
+    
+    def connection(self):
+        return SimpleNamespace(connection=SimpleNamespace(cursor=lambda: self.cursor))
+    
+    def execute(self, statement, rows):
+        self.executed.append((statement, rows))
+
+
+def memory_rows(count, **values):
+    return [
+        {"agent_id": 1, "memory_type": "episodic", "memory_category": "task", "content": f"memory {i}", **values}
+        for i in range(count)
+    ]
+
+
+def column_type(name):
+    return Memory.__table__.c[name].type.dialect_impl(PGDialect_psycopg2())
+
+
+@pytest.mark.parametrize("name, value, expected", [
+    ("content", "plain", '"plain"'),
+    ("content", 'say "hi"', '"say ""hi"""'),
+    ("content", "line one\nline two,\r\n", '"line one\nline two,\r\n"'),
+    ("content", "back\\slash", '"back\\slash"'),
+    ("content", "\\.", '"\\."'),
+    ("content", "", '""'),
+    ("content", None, ""),
+    ("importance", 0.25, '"0.25"'),
+    ("tags", None, ""),
+    ("tags", ["a", 'b"c'], '"[""a"",""b\\""c""]"'),
+    ("related_memories", [1, None, 3], '"{1,NULL,3}"'),
+    ("related_memories", [], '"{}"'),
+])
+def test_copy_field_quotes_values(name, value, expected):
+    assert _copy_field(column_type(name), value) == expected
+
+
+def test_copy_field_encodes_bytes_as_hex():
+    assert _copy_field(postgresql.BYTEA(), b"\x00\xff") == '"\\x00ff"'
+
+
+def test_copy_field_json_round_trips_through_csv():
+    metadata = {"quote": 'a "b"', "lines": "x\ny", "nested": {"list": [1, None]}}
+    field = _copy_field(column_type("memory_metadata"), metadata)
+    
+    (parsed,) = next(csv.reader(io.StringIO(field)))
+    assert json_loads(parsed) == metadata
+
+
+def test_bulk_insert_streams_large_batches_with_copy():
+    session = FakeSession(PGDialect_psycopg2())
+    rows = memory_rows(COPY_MIN_ROWS, context=None)
+    rows[0]["content"] = 'has "quotes", commas\nand newlines'
+    
+    bulk_insert(session, Memory.__table__, rows)
+    
+    assert not session.executed
+    assert session.cursor.sql.startswith("COPY memories (agent_id, memory_type, memory_category, content, context, ")
+    assert session.cursor.sql.endswith("FROM STDIN WITH (FORMAT csv)")
+    
+    header = session.cursor.sql[session.cursor.sql.index("(") + 1:session.cursor.sql.index(")")].split(", ")
+    records = list(csv.reader(io.StringIO(session.cursor.data)))
+    assert len(records) == COPY_MIN_ROWS
+    first = dict(zip(header, records[0]))
+    assert first["content"] == rows[0]["content"]
+    # Client-side defaults are filled in because COPY does not apply them
+    assert first["importance"] == "0.5" and first["access_count"] == "0" and first["created_at"]
+    # NULL is written as an unquoted empty field
+    assert session.cursor.data.splitlines()[-1].split(",")[4] == ""
+
+
+@pytest.mark.parametrize("dialect, count", [
+    (PGDialect_psycopg2(), COPY_MIN_ROWS - 1),
+    (sqlite.dialect(), COPY_MIN_ROWS),
+])
+def test_bulk_insert_uses_executemany_otherwise(dialect, count):
+    session = FakeSession(dialect)
+    rows = memory_rows(count)
+    
+    bulk_insert(session, Memory.__table__, rows)
+    
+    assert session.cursor.sql is None
+    assert session.executed[0][1] is rows
@@ -0,0 +1,115 @@
+"""
+Unit tests for the staged TaskDispatcher.
+"""
+
+import asyncio
+
+import pytest
+
+import agents.dispatcher as dispatcher_module
+from agents.dispatcher import TaskDispatcher
+from shared.models import TaskRequest, TaskResponse
+
+
+class RecordingAgent:
+    """Agent stand-in that records the order tasks run and are logged in."""
+    
+    agent_name = "recorder"
+    
+    def __init__(self):
+        self.ran = []
+        self.logged = []
+        self.release = asyncio.Event()
+    
+    async def dispatch(self, task_request):
+        if task_request.task_type == "block":
+            await self.release.wait()
+        self.ran.append(task_request.description)
+        if task_request.task_type == "fail":
+            raise RuntimeError("task failed")
+        return TaskResponse(task_id=task_request.task_id, agent_name=self.agent_name, success=True, execution_time=0.0)
+    
+    def log_task(self, task_request, task_response):
+        self.logged.append(task_request.description)
+
+
+def request(description, task_type="work", priority=1):
+    return TaskRequest(agent_name="recorder", task_type=task_type, description=description, priority=priority)
+
+
+async def run_blocked(dispatcher, agent, *requests):
+    """Submit requests while the single run worker is busy, then let them all run."""
+    blocker = dispatcher.submit(request("blocker", "block"))
+    await asyncio.sleep(0)
+    futures = [dispatcher.submit(task_request) for task_request in requests]
+    await asyncio.sleep(0.05)
+    agent.release.set()
+    await asyncio.gather(blocker, *futures)
+
+
+@pytest.mark.asyncio
+async def test_futures_resolve_and_log_stage_records_tasks():
+    agent = RecordingAgent()
+    dispatcher = TaskDispatcher(agent)
+    try:
+        response = await dispatcher.submit(request("ok"))
+        with pytest.raises(RuntimeError, match="task failed"):
+            await dispatcher.submit(request("broken", "fail"))
+        await dispatcher.join()
+    finally:
+        await dispatcher.stop()
+    
+    assert response.success and response.task_id
+    assert agent.logged == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first():
+    agent = RecordingAgent()
+    dispatcher = TaskDispatcher(agent, run_workers=1)
+    try:
+        await run_blocked(dispatcher, agent, request("low", priority=1), request("high", priority=5))
+    finally:
+        await dispatcher.stop()
+    
+    assert agent.ran == ["blocker", "high", "low"]
+
+
+@pytest.mark.asyncio
+async def test_demoted_task_types_wait_behind_others():
+    agent = RecordingAgent()
+    dispatcher = TaskDispatcher(agent, run_workers=1)
+    dispatcher._type_levels["slow"] = 2
+    try:
+        await run_blocked(dispatcher, agent, request("slow", "slow", priority=5), request("fast", priority=1))
+    finally:
+        await dispatcher.stop()
+    
+    assert agent.ran == ["blocker", "fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_aging_returns_pending_tasks_to_top_level(monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "AGING_INTERVAL", 0.01)
+    agent = RecordingAgent()
+    dispatcher = TaskDispatcher(agent, run_workers=1)
+    dispatcher._type_levels["slow"] = 2
+    try:
+        await run_blocked(dispatcher, agent, request("slow", "slow", priority=5), request("fast", priority=1))
+    finally:
+        await dispatcher.stop()
+    
+    assert agent.ran == ["blocker", "slow", "fast"]
+
+
+def test_update_level_demotes_overruns_and_promotes_quick_runs():
+    dispatcher = TaskDispatcher(RecordingAgent())
+    for _ in range(dispatcher_module.MAX_LEVEL + 2):
+        dispatcher._update_level("slow", dispatcher_module.QUANTUM + 1)
+    assert dispatcher._type_levels["slow"] == dispatcher_module.MAX_LEVEL
+    
+    dispatcher._update_level("slow", 0.0)
+    assert dispatcher._type_levels["slow"] == dispatcher_module.MAX_LEVEL - 1
+    for _ in range(dispatcher_module.MAX_LEVEL):
+        dispatcher._update_level("slow", 0.0)
+    assert "slow" not in dispatcher._type_levels
@@ -0,0 +1,58 @@
+"""
+Unit tests for the restricted arithmetic evaluator used by math_calculation.
+"""
+
+import time
+
+import pytest
+
+from agents.generic_agent import MAX_INTEGER_BITS, _evaluate_expression
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2*(3+4)", 14),
+    ("-3 + 10 // 4", -1),
+    ("2**10", 1024),
+    ("(9**99)**9 - 9**891", 0),
+    ("sqrt(16) + max(1, 2)", 6.0),
+    ("round(pi, 2)", 3.14),
+])
+def test_evaluates_arithmetic(expression, expected):
+    assert _evaluate_expression(expression) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    "x + 1",
+    "__builtins__",
+    "__import__('os')",
+    "open('/etc/passwd')",
+    "sqrt(x=4)",
+    "(1).__class__",
+    "pi.real",
+    "[1, 2]",
+    "'a' * 3",
+    "True + 1",
+    "lambda: 1",
+])
+def test_rejects_names_calls_and_attributes(expression):
+    with pytest.raises(ValueError):
+        _evaluate_expression(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "9**9**9",
+    "(9**999)**999",
+    "((9**999)**999)**999",
+    "2**(MAX + 1)".replace("MAX", str(MAX_INTEGER_BITS)),
+    "(2**5000) * (2**5001)",
+])
+def test_rejects_oversized_integers_quickly(expression):
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match="too large"):
+        _evaluate_expression(expression)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_allows_results_up_to_the_limit():
+    assert _evaluate_expression(f"2**{MAX_INTEGER_BITS - 1}").bit_length() == MAX_INTEGER_BITS
+    assert _evaluate_expression("2**-100000") == 0.0
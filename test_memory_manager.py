@@ -0,0 +1,251 @@
+"""
+Unit tests for memory storage in database.memory_manager.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import database.manager as db_manager_module
+import database.memory_manager as memory_module
+from agents.base_agent import BaseAgent
+from database.memory_manager import (
+    MemoryManager, _AccessBuffer, _MemoryWriteBuffer, _content_hash, bulk_insert_memories
+)
+from database.models import Agent, AgentState, Memory
+
+
+@pytest.fixture
+def db(db):
+    """The test database with one agent to store memories for."""
+    with db.session_scope() as session:
+        session.add(Agent(
+            name="tester", model="m", personality="p", job_description="j",
+            system_prompt="s", goal="g"
+        ))
+    return db
+
+
+@pytest.fixture
+def without_upsert(monkeypatch):
+    """Take the path used on databases without ON CONFLICT support."""
+    monkeypatch.setattr(memory_module, "dialect_insert", lambda session: None)
+
+
+def agent_id(db):
+    with db.session_scope() as session:
+        return session.query(Agent.id).filter_by(name="tester").scalar()
+
+
+def memory_row(db, content):
+    return {
+        "agent_id": agent_id(db),
+        "memory_type": "episodic",
+        "memory_category": "task",
+        "content": content,
+        "content_hash": _content_hash(content),
+        "importance": 0.5,
+    }
+
+
+def stored_contents(db):
+    with db.session_scope() as session:
+        return sorted(content for (content,) in session.query(Memory.content))
+
+
+@pytest.mark.parametrize("upsert", [True, False])
+def test_bulk_insert_skips_duplicates(db, monkeypatch, upsert):
+    if not upsert:
+        monkeypatch.setattr(memory_module, "dialect_insert", lambda session: None)
+    
+    with db.session_scope() as session:
+        bulk_insert_memories(session, [memory_row(db, "a"), memory_row(db, "b"), memory_row(db, "a")])
+    with db.session_scope() as session:
+        bulk_insert_memories(session, [memory_row(db, "b"), memory_row(db, "c")])
+    
+    assert stored_contents(db) == ["a", "b", "c"]
+
+
+def test_store_memory_without_upsert_returns_existing_id(db, without_upsert):
+    manager = MemoryManager()
+    first = manager.store_memory("tester", "episodic", "task", "remember this")
+    second = manager.store_memory("tester", "episodic", "task", "remember this")
+    other = manager.store_memory("tester", "episodic", "task", "something else")
+    
+    assert first is not None and first == second
+    assert other not in (None, first)
+    assert stored_contents(db) == ["remember this", "something else"]
+
+
+def test_agent_record_without_upsert_inserts_then_updates(db):
+    agent = SimpleNamespace(config=SimpleNamespace(name="generic"))
+    agent_values = {
+        "model": "m", "personality": "p", "job_description": "j",
+        "system_prompt": "s", "goal": "g"
+    }
+    state_values = {"status": "idle", "agent_metadata": {}}
+    
+    with db.session_scope() as session:
+        ids = BaseAgent._save_database_record(agent, session, agent_values, state_values)
+    with db.session_scope() as session:
+        again = BaseAgent._save_database_record(
+            agent, session, {**agent_values, "goal": "new goal"}, {**state_values, "status": "busy"}
+        )
+        
+    assert again == ids
+    with db.session_scope() as session:
+        assert session.query(Agent.goal).filter_by(name="generic").scalar() == "new goal"
+        assert session.query(AgentState.status).filter_by(agent_id=ids[0]).scalar() == "busy"
+        assert session.query(AgentState).count() == 1
+
+
+def test_create_tables_backfills_content_hashes(db, monkeypatch):
+    monkeypatch.setattr(db_manager_module, "CONTENT_HASH_BATCH", 2)
+    with db.session_scope() as session:
+        bulk_insert_memories(session, [memory_row(db, "hashed")])
+        session.execute(Memory.__table__.insert(), [
+            {**memory_row(db, content), "content_hash": None}
+            for content in ("old", "older", "old", "hashed", "oldest")
+        ])
+    
+    db.create_tables()
+    
+    with db.session_scope() as session:
+        rows = session.query(Memory.content, Memory.content_hash).order_by(Memory.id).all()
+    assert rows == [
+        ("hashed", _content_hash("hashed")),
+        ("old", _content_hash("old")),
+        ("older", _content_hash("older")),
+        # Duplicates of an already hashed row keep NULL instead of breaking the unique index
+        ("old", None),
+        ("hashed", None),
+        ("oldest", _content_hash("oldest")),
+    ]
+    
+    manager = MemoryManager()
+    assert manager.store_memory("tester", "episodic", "task", "older") is not None
+    assert stored_contents(db).count("older") == 1
+
+
+def test_write_buffer_resolves_futures_with_memory_ids(db):
+    buffer = _MemoryWriteBuffer(batch_size=3)
+    contents = ["a", "b", "c", "d", "a", "e", "f"]
+    futures = [buffer.enqueue(memory_row(db, content)) for content in contents]
+    buffer.flush()
+    
+    ids = [future.result(timeout=1) for future in futures]
+    assert None not in ids
+    assert ids[0] == ids[4] and len(set(ids)) == 6
+    assert stored_contents(db) == ["a", "b", "c", "d", "e", "f"]
+
+
+def test_write_buffer_writes_at_once_and_batches_rows_queued_meanwhile(db, monkeypatch):
+    buffer = _MemoryWriteBuffer()
+    release = threading.Event()
+    batches = []
+    write = buffer._write
+    
+    def slow_write(batch):
+        batches.append(len(batch))
+        release.wait(2.0)
+        write(batch)
+    
+    monkeypatch.setattr(buffer, "_write", slow_write)
+    first = buffer.enqueue(memory_row(db, "first"))
+    while not batches:
+        time.sleep(0.005)
+    
+    # The lone row went out without waiting for company; these pile up behind it
+    rest = [buffer.enqueue(memory_row(db, f"next {i}")) for i in range(5)]
+    release.set()
+    buffer.flush()
+    
+    assert batches == [1, 5]
+    assert None not in [future.result(timeout=1) for future in [first, *rest]]
+
+
+def test_write_buffer_fails_only_the_broken_batch(db):
+    buffer = _MemoryWriteBuffer(batch_size=1)
+    broken = buffer.enqueue({**memory_row(db, "broken"), "content": None})
+    stored = buffer.enqueue(memory_row(db, "kept"))
+    buffer.flush()
+    
+    with pytest.raises(Exception):
+        broken.result(timeout=1)
+    assert stored.result(timeout=1) is not None
+    assert stored_contents(db) == ["kept"]
+
+
+def test_queued_memory_invalidates_cached_reads(db):
+    manager = MemoryManager()
+    assert manager.retrieve_memories("tester") == []
+    
+    future = manager.queue_memory("tester", "episodic", "task", "queued")
+    manager.flush()
+    
+    assert future.result(timeout=1) is not None
+    assert [memory["content"] for memory in manager.retrieve_memories("tester")] == ["queued"]
+    manager.flush()
+
+
+def test_queue_memory_for_unknown_agent_resolves_to_none(db):
+    assert MemoryManager().queue_memory("nobody", "episodic", "task", "lost").result(timeout=1) is None
+
+
+def access_counts(db):
+    with db.session_scope() as session:
+        return {content: (count, accessed_at) for content, count, accessed_at in session.query(
+            Memory.content, Memory.access_count, Memory.accessed_at
+        )}
+
+
+def test_access_buffer_combines_accesses_into_one_write(db):
+    with db.session_scope() as session:
+        bulk_insert_memories(session, [memory_row(db, "a"), memory_row(db, "b")])
+    with db.session_scope() as session:
+        ids = dict(session.query(Memory.content, Memory.id))
+    
+    buffer = _AccessBuffer(interval=60.0)
+    earlier = datetime(2026, 1, 1)
+    later = earlier + timedelta(hours=1)
+    assert buffer.record([ids["a"], ids["b"]], earlier) == {ids["a"]: 1, ids["b"]: 1}
+    assert buffer.record([ids["a"]], later) == {ids["a"]: 2}
+    assert access_counts(db)["a"][0] == 0
+    
+    buffer.flush()
+    counts = access_counts(db)
+    assert counts["a"] == (2, later) and counts["b"] == (1, earlier)
+    
+    buffer.flush()
+    assert access_counts(db)["a"][0] == 2
+
+
+def test_access_buffer_flushes_in_the_background(db):
+    with db.session_scope() as session:
+        bulk_insert_memories(session, [memory_row(db, "a")])
+    with db.session_scope() as session:
+        memory_id = session.query(Memory.id).scalar()
+    
+    buffer = _AccessBuffer(interval=0.05)
+    buffer.record([memory_id], datetime.utcnow())
+    
+    deadline = time.monotonic() + 2.0
+    while access_counts(db)["a"][0] == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert access_counts(db)["a"][0] == 1
+
+
+def test_reads_and_cached_reads_count_as_accesses(db):
+    with db.session_scope() as session:
+        bulk_insert_memories(session, [memory_row(db, "a")])
+    
+    manager = MemoryManager()
+    first = manager.retrieve_memories("tester")
+    second = manager.retrieve_memories("tester")
+    manager.flush()
+    
+    assert (first[0]["access_count"], second[0]["access_count"]) == (1, 2)
+    assert access_counts(db)["a"][0] == 2
@@ -0,0 +1,132 @@
+"""
+Unit tests for relationship loading of the database models.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import joinedload, selectinload
+
+from database.memory_manager import MemoryManager, _content_hash, bulk_insert_memories
+from database.models import Agent, AgentState, Base, Memory, MemoryRelationship
+
+
+@pytest.fixture
+def db(db):
+    """The test database with two agents, each with a state row."""
+    with db.session_scope() as session:
+        for name in ("small", "large"):
+            agent = Agent(
+                name=name, model="m", personality="p", job_description="j",
+                system_prompt="s", goal="g"
+            )
+            session.add(agent)
+            session.flush()
+            session.add(AgentState(agent_id=agent.id, status="idle"))
+    return db
+
+
+@contextmanager
+def count_queries(db):
+    """Count the statements sent to the database inside the block."""
+    statements = []
+    
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def add_memories(db, agent_name, count):
+    with db.session_scope() as session:
+        agent_id = session.query(Agent.id).filter_by(name=agent_name).scalar()
+        bulk_insert_memories(session, [
+            {
+                "agent_id": agent_id,
+                "memory_type": "episodic",
+                "memory_category": "task",
+                "content": f"memory {i}",
+                "content_hash": _content_hash(f"memory {i}"),
+                "tags": [],
+                "importance": 0.5,
+            }
+            for i in range(count)
+        ])
+
+
+@pytest.mark.parametrize("relationship", ["states", "messages", "tasks"])
+def test_agent_collections_refuse_lazy_loading(db, relationship):
+    with db.session_scope() as session:
+        agent = session.query(Agent).first()
+        with pytest.raises(InvalidRequestError):
+            getattr(agent, relationship)
+
+
+def test_memory_agent_refuses_lazy_loading(db):
+    add_memories(db, "small", 1)
+    with db.session_scope() as session:
+        memory = session.query(Memory).first()
+        with pytest.raises(InvalidRequestError):
+            memory.agent
+
+
+@pytest.mark.parametrize("relationship", [
+    relationship
+    for mapper in Base.registry.mappers
+    for relationship in mapper.relationships
+], ids=str)
+def test_every_relationship_raises_on_lazy_load(relationship):
+    assert relationship.lazy == "raise"
+
+
+def test_memory_relationship_ends_refuse_lazy_loading(db):
+    add_memories(db, "small", 2)
+    with db.session_scope() as session:
+        source_id, target_id = (memory_id for (memory_id,) in session.query(Memory.id))
+        session.add(MemoryRelationship(
+            source_memory_id=source_id, target_memory_id=target_id, relationship_type="related"
+        ))
+    
+    with db.session_scope() as session:
+        link = session.query(MemoryRelationship).one()
+        with pytest.raises(InvalidRequestError):
+            link.source_memory
+        
+        link = session.query(MemoryRelationship).options(
+            joinedload(MemoryRelationship.source_memory), joinedload(MemoryRelationship.target_memory)
+        ).populate_existing().one()
+        assert (link.source_memory.id, link.target_memory.id) == (source_id, target_id)
+
+
+def test_eager_loading_uses_a_fixed_number_of_queries(db):
+    add_memories(db, "small", 3)
+    with db.session_scope() as session, count_queries(db) as statements:
+        agents = session.query(Agent).options(selectinload(Agent.states)).all()
+        assert all(len(agent.states) == 1 for agent in agents)
+        memories = session.query(Memory).options(joinedload(Memory.agent)).all()
+        assert {memory.agent.name for memory in memories} == {"small"}
+    
+    assert len(statements) == 3
+
+
+def test_retrieve_memories_query_count_does_not_grow_with_rows(db):
+    add_memories(db, "small", 1)
+    add_memories(db, "large", 50)
+    
+    counts = {}
+    for name in ("small", "large"):
+        manager = MemoryManager()
+        with count_queries(db) as statements:
+            memories = manager.retrieve_memories(name, limit=100)
+        counts[name] = (len(memories), len(statements))
+        # Write the buffered access counts while the test database is patched in
+        manager.flush()
+    
+    assert counts["small"][0] == 1 and counts["large"][0] == 50
+    assert counts["small"][1] == counts["large"][1]
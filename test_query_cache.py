@@ -0,0 +1,98 @@
+"""
+Unit tests for the execute_query SELECT cache of DatabaseManager.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import event, text
+
+
+@pytest.fixture
+def db(db, monkeypatch):
+    """The test database with a long cache TTL and a scratch items table."""
+    monkeypatch.setattr(db.config.database, "query_cache_ttl", 60.0)
+    write(db, "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    return db
+
+
+def write(db, statement):
+    with db.session_scope() as session:
+        session.execute(text(statement))
+
+
+def count(db):
+    return db.execute_query("SELECT COUNT(*) AS n FROM items")[0].n
+
+
+def test_select_results_are_reused_until_cleared(db):
+    assert count(db) == 0
+    
+    # Written outside the engine, so no commit hook clears the cache
+    connection = sqlite3.connect(db.engine.url.database)
+    connection.execute("INSERT INTO items (name) VALUES ('a')")
+    connection.commit()
+    connection.close()
+    assert count(db) == 0
+    
+    db.clear_query_cache()
+    assert count(db) == 1
+
+
+def test_committed_write_invalidates_cache(db):
+    assert count(db) == 0
+    write(db, "INSERT INTO items (name) VALUES ('a')")
+    assert count(db) == 1
+    write(db, "INSERT INTO items (name) VALUES ('b')")
+    assert count(db) == 2
+
+
+def test_rolled_back_write_keeps_cache(db):
+    assert count(db) == 0
+    with pytest.raises(RuntimeError):
+        with db.session_scope() as session:
+            session.execute(text("INSERT INTO items (name) VALUES ('a')"))
+            raise RuntimeError("abort")
+    assert db._query_cache
+    assert count(db) == 0
+
+
+def test_cached_rows_cannot_be_modified_by_callers(db):
+    write(db, "INSERT INTO items (name) VALUES ('a')")
+    db.execute_query("SELECT name FROM items").clear()
+    assert [row.name for row in db.execute_query("SELECT name FROM items")] == ["a"]
+
+
+def test_zero_ttl_disables_cache(db, monkeypatch):
+    monkeypatch.setattr(db.config.database, "query_cache_ttl", 0)
+    assert count(db) == 0
+    assert not db._query_cache
+
+
+def test_data_modifying_cte_is_not_cached(db):
+    insert = "WITH v(n) AS (SELECT 'b') INSERT INTO items (name) SELECT n FROM v RETURNING id"
+    assert [row.id for row in db.execute_query(insert)] == [1]
+    assert [row.id for row in db.execute_query(insert)] == [2]
+    assert count(db) == 2
+
+
+def test_data_modifying_cte_invalidates_cache(db):
+    assert count(db) == 0
+    db.execute_query("WITH v(n) AS (SELECT 'b') INSERT INTO items (name) SELECT n FROM v RETURNING id")
+    assert count(db) == 1
+
+
+def test_read_overlapping_a_write_commit_is_not_stored(db):
+    writes = ["INSERT INTO items (name) VALUES ('a')"]
+    
+    # Another session commits a write while the counting query is in flight
+    def commit_concurrent_write(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT COUNT(*)") and writes:
+            write(db, writes.pop())
+    
+    event.listen(db.engine, "before_cursor_execute", commit_concurrent_write)
+    try:
+        assert count(db) == 1
+    finally:
+        event.remove(db.engine, "before_cursor_execute", commit_concurrent_write)
+    assert not db._query_cache
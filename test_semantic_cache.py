@@ -0,0 +1,41 @@
+"""
+Unit tests for the LLM response similarity cache.
+"""
+
+import pytest
+
+from shared.config import AgentConfig
+from shared.semantic_cache import SemanticCache
+
+
+def test_hits_for_the_same_prompt_ignoring_case_and_punctuation():
+    cache = SemanticCache()
+    cache.put("Convert the CSV file to JSON.", "answer")
+    assert cache.get("convert the csv file to json") == "answer"
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("convert A to B", "convert B to A"),
+    ("sort ascending not descending", "sort descending not ascending"),
+    ("copy the source file to the backup folder", "copy the backup file to the source folder"),
+])
+def test_misses_for_reordered_prompts(stored, asked):
+    cache = SemanticCache()
+    cache.put(stored, "answer")
+    assert cache.get(asked) is None
+    assert cache.misses == 1
+
+
+def test_misses_for_unrelated_prompts():
+    cache = SemanticCache()
+    cache.put("review this python function", "answer")
+    assert cache.get("summarize the meeting notes") is None
+
+
+def test_is_disabled_by_default():
+    config = AgentConfig(
+        name="agent", model="model", personality="p", job_description="j",
+        system_prompt="s", goal="g"
+    )
+    assert config.semantic_cache_enabled is False
@@ -0,0 +1,214 @@
+"""
+Unit tests for the write-behind buffers of the agents.
+"""
+
+import asyncio
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+import agents.base_agent as base_agent
+from agents.base_agent import BaseAgent, _MESSAGE_INSERT, _TASK_INSERT, _enqueue_row, flush_pending_writes
+from agents.generic_agent import MEMORY_WRITE_RETRIES, GenericAgent
+from database.models import Task
+from shared.models import AgentStatus
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Capture the batches the row flusher writes instead of touching a database."""
+    batches = []
+    monkeypatch.setattr(base_agent, "_write_rows", batches.append)
+    return batches
+
+
+class StatusRecorder:
+    """Carries BaseAgent's status write-back methods and records each database write."""
+    
+    update_status = BaseAgent.update_status
+    _state_flusher = BaseAgent._state_flusher
+    _flush_state_once = BaseAgent._flush_state_once
+    flush_state = BaseAgent.flush_state
+    
+    def __init__(self, db_state_id=1):
+        self._db_state_id = db_state_id
+        self._state_dirty = False
+        self._state_flusher_task = None
+        self.writes = []
+    
+    def _write_status(self, status, task, last_activity_ts):
+        self.writes.append((status, task))
+
+
+class MemoryRecorder:
+    """Carries GenericAgent's task memory writer and hands out futures the test resolves."""
+    
+    agent_name = "recorder"
+    _queue_task_memory = GenericAgent._queue_task_memory
+    _memory_writer = GenericAgent._memory_writer
+    _submit_task_memory = GenericAgent._submit_task_memory
+    _task_memory_written = GenericAgent._task_memory_written
+    _retry_task_memory = GenericAgent._retry_task_memory
+    
+    def __init__(self):
+        self._memory_queue = None
+        self._memory_writer_task = None
+        self._memory_retries = set()
+        self.futures = []
+    
+    def _store_task_memory(self, task_request, task_response, result):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+def task_row(i):
+    return {"agent_id": 1, "task_id": f"task-{i}", "task_type": "work", "description": f"task {i}"}
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_every_row_in_bounded_batches(written):
+    for i in range(2 * base_agent.MAX_BATCH + 50):
+        _enqueue_row(_TASK_INSERT, task_row(i))
+    await flush_pending_writes()
+    
+    assert all(len(batch) <= base_agent.MAX_BATCH for batch in written)
+    rows = [row for batch in written for _, row in batch]
+    assert rows == [task_row(i) for i in range(2 * base_agent.MAX_BATCH + 50)]
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_rows_within_flush_interval(written):
+    _enqueue_row(_TASK_INSERT, task_row(0))
+    await asyncio.sleep(base_agent.FLUSH_MS / 1000 + 0.1)
+    
+    assert written == [[(_TASK_INSERT, task_row(0))]]
+    await flush_pending_writes()
+
+
+@pytest.mark.asyncio
+async def test_flusher_restarts_after_flush(written):
+    _enqueue_row(_TASK_INSERT, task_row(0))
+    await flush_pending_writes()
+    _enqueue_row(_TASK_INSERT, task_row(1))
+    await flush_pending_writes()
+    
+    assert [row for batch in written for _, row in batch] == [task_row(0), task_row(1)]
+
+
+def test_rows_are_written_directly_without_a_running_loop(written):
+    _enqueue_row(_TASK_INSERT, task_row(0))
+    assert written == [[(_TASK_INSERT, task_row(0))]]
+
+
+def test_write_rows_keeps_tables_independent(db):
+    # The message row lacks its required conversation, so only its table fails
+    base_agent._write_rows([
+        (_MESSAGE_INSERT, {"agent_id": 1, "message_type": "user", "content": "hi"}),
+        (_TASK_INSERT, task_row(0)),
+        (_TASK_INSERT, task_row(1)),
+    ])
+    
+    with db.session_scope() as session:
+        assert sorted(task_id for (task_id,) in session.query(Task.task_id)) == ["task-0", "task-1"]
+
+
+@pytest.mark.asyncio
+async def test_status_changes_are_combined_into_one_write(monkeypatch):
+    monkeypatch.setattr(base_agent, "STATE_FLUSH_INTERVAL", 0.05)
+    agent = StatusRecorder()
+    
+    await agent.update_status(AgentStatus.BUSY, "first")
+    await agent.update_status(AgentStatus.BUSY, "second")
+    await agent.update_status(AgentStatus.IDLE)
+    assert agent.writes == []
+    
+    await asyncio.sleep(0.15)
+    assert agent.writes == [(AgentStatus.IDLE, None)]
+    await agent.flush_state()
+
+
+@pytest.mark.asyncio
+async def test_flush_state_writes_pending_status_and_stops_flusher():
+    agent = StatusRecorder()
+    await agent.update_status(AgentStatus.BUSY, "work")
+    await agent.flush_state()
+    
+    assert agent.writes == [(AgentStatus.BUSY, "work")]
+    assert agent._state_flusher_task is None
+    
+    await agent.flush_state()
+    assert len(agent.writes) == 1
+
+
+@pytest.mark.asyncio
+async def test_status_is_not_written_without_a_state_row():
+    agent = StatusRecorder(db_state_id=None)
+    await agent.update_status(AgentStatus.BUSY, "work")
+    await agent.flush_state()
+    
+    assert agent.writes == []
+    assert agent.status == AgentStatus.BUSY
+
+
+_real_sleep = asyncio.sleep
+
+
+async def fast_sleep(delay):
+    """Skip retry backoff while still yielding to the loop."""
+    await _real_sleep(0)
+
+
+async def wait_for_futures(agent, count):
+    while len(agent.futures) < count:
+        await _real_sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_memory_writer_does_not_wait_for_each_write():
+    agent = MemoryRecorder()
+    for i in range(20):
+        agent._queue_task_memory(SimpleNamespace(task_type="work"), None, i)
+    
+    # Every task is handed to the memory writer before any write finished
+    await asyncio.wait_for(wait_for_futures(agent, 20), 2.0)
+    
+    for future in agent.futures:
+        future.set_result(1)
+    await asyncio.wait_for(agent._memory_queue.join(), 2.0)
+    agent._memory_writer_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_memory_writer_retries_failed_writes(monkeypatch):
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    agent = MemoryRecorder()
+    agent._queue_task_memory(SimpleNamespace(task_type="work"), None, None)
+    
+    await asyncio.wait_for(wait_for_futures(agent, 1), 2.0)
+    agent.futures[0].set_exception(RuntimeError("database is locked"))
+    await asyncio.wait_for(wait_for_futures(agent, 2), 2.0)
+    joined = asyncio.ensure_future(agent._memory_queue.join())
+    await _real_sleep(0.02)
+    assert not joined.done()
+    
+    agent.futures[1].set_result(1)
+    await asyncio.wait_for(joined, 2.0)
+    assert len(agent.futures) == 2
+    agent._memory_writer_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_memory_writer_gives_up_after_the_last_retry(monkeypatch):
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    agent = MemoryRecorder()
+    agent._queue_task_memory(SimpleNamespace(task_type="work"), None, None)
+    
+    for attempt in range(MEMORY_WRITE_RETRIES):
+        await asyncio.wait_for(wait_for_futures(agent, attempt + 1), 2.0)
+        agent.futures[attempt].set_result(None)
+    
+    await asyncio.wait_for(agent._memory_queue.join(), 2.0)
+    assert len(agent.futures) == MEMORY_WRITE_RETRIES
+    agent._memory_writer_task.cancel()